@@ -15,4 +15,9 @@ app.conf.beat_schedule = {
         'task': 'core.tasks.send_worker_event_notifications',
         'schedule': crontab(minute=30, hour=21),  # каждый день в 21:30
     },
+    # Перенос старой истории и логов в архив (core/archive.py)
+    'archive-old-records': {
+        'task': 'core.tasks.archive_old_records_task',
+        'schedule': crontab(minute=0, hour=4),  # каждый день в 04:00
+    },
 }
@@ -69,6 +69,14 @@ CORS_ALLOW_HEADERS = [
     "content-type",
     "authorization",
     "x-csrftoken",
+    "if-none-match",
+    "idempotency-key",
+]
+
+# Валидаторы условного GET должны быть видны фронтенду
+CORS_EXPOSE_HEADERS = [
+    "etag",
+    "last-modified",
 ]
 
 CORS_ALLOW_CREDENTIALS = True
@@ -84,6 +92,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",  # pg_trgm-поиск клиентов (TrigramSimilarity, GinIndex)
     "corsheaders",
     "core",
     "django_celery_beat",
@@ -102,6 +111,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "core.middleware.CurrentUserMiddleware",
+    "core.middleware.HistoryBufferMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -193,6 +203,21 @@ CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
 CELERY_TIMEZONE = "Asia/Tashkent"
 CELERY_ENABLE_UTC = False
 
+# Сколько месяцев история и логи хранятся в основных таблицах, прежде чем задача
+# core.tasks.archive_old_records_task перенесёт их в архив, а отметки об удалении
+# мероприятий (EventTombstone) - удалит: клиенты дельта-синхронизации, не
+# приходившие дольше этого срока, получают 410 и делают полную загрузку.
+# None или модель, не указанная здесь, - хранить в основной таблице бессрочно.
+ARCHIVE_RETENTION_MONTHS = {
+    "EventHistory": 24,
+    "ClientHistory": 24,
+    "EventLog": 12,
+    "TelegramContractLog": 6,
+    "TelegramAdvanceNotificationLog": 6,
+    "WorkerNotificationLog": 3,
+    "EventTombstone": 3,
+}
+
 
 REST_FRAMEWORK = {
     # Без Z и смещения, чтобы фронт получал локальное время сервера (Asia/Tashkent)
@@ -202,6 +227,15 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",  # Доступ по умолчанию только для авторизованных пользователей
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",  # orjson вместо json.dumps - в разы быстрее на больших списках
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,  # Количество объектов на страницу
 }
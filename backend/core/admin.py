@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Client, ClientHistory, PhoneClient, Workers, Service, Device, Event, EventHistory, EventLog
+from .models import ArchivedRecord, Client, ClientHistory, PhoneClient, Workers, Service, Device, Event, EventHistory, EventLog
 
 admin.site.register(Client)
 admin.site.register(PhoneClient)
@@ -35,3 +35,16 @@ class ClientHistoryAdmin(admin.ModelAdmin):
 
     def has_change_permission(self, request, obj=None):
         return False
+
+
+@admin.register(ArchivedRecord)
+class ArchivedRecordAdmin(admin.ModelAdmin):
+    list_display = ["source", "original_id", "owner_id", "recorded_at"]
+    list_filter = ["source"]
+    readonly_fields = [f.name for f in ArchivedRecord._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -10,3 +10,5 @@ class CoreConfig(AppConfig):
         import core.tasks
         # Сигналы для истории изменений договора (Event/Client)
         import core.signals
+        # Лукап name__ilike_contains для поиска клиентов
+        import core.lookups
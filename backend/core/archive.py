@@ -0,0 +1,204 @@
+import heapq
+import logging
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    ArchivedRecord, ClientHistory, EventHistory, EventLog, EventTombstone, TelegramAdvanceNotificationLog,
+    TelegramContractLog, WorkerNotificationLog,
+)
+
+logger = logging.getLogger(__name__)
+
+# Модель -> (поле владельца, поле времени, связи для select_related при чтении архива)
+ARCHIVED_MODELS = {
+    EventHistory: ("event", "changed_at", ("changed_by",)),
+    ClientHistory: ("client", "changed_at", ("changed_by",)),
+    EventLog: ("event", "created_at", ()),
+    TelegramContractLog: ("event", "sent_at", ()),
+    TelegramAdvanceNotificationLog: ("event", "sent_at", ()),
+    WorkerNotificationLog: ("worker", "sent_at", ("worker",)),
+}
+
+# Модель -> поле времени: строки, которые по истечении срока просто удаляются
+PURGED_MODELS = {
+    EventTombstone: "deleted_at",
+}
+# Сколько строк переносим одной транзакцией
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def include_archived(request):
+    """Архивные строки отдаются только по явному ?include_archived=1."""
+    return request.query_params.get("include_archived") in ("1", "true")
+
+
+def retention_policy():
+    """Сроки хранения по имени модели - только из settings.ARCHIVE_RETENTION_MONTHS."""
+    return getattr(settings, "ARCHIVE_RETENTION_MONTHS", {})
+
+
+def retention_cutoff(model):
+    """Граница срока хранения model: строки старше неё уже перенесены или удалены. None - бессрочно."""
+    months = retention_policy().get(model.__name__)
+    if months is None:
+        return None
+    return timezone.now() - relativedelta(months=months)
+
+
+def _to_archive(model, row):
+    owner_field, time_field, _ = ARCHIVED_MODELS[model]
+    owner_attname = model._meta.get_field(owner_field).attname
+    data = {
+        field.attname: getattr(row, field.attname)
+        for field in model._meta.concrete_fields
+        if field.attname not in ("id", owner_attname, time_field)
+    }
+    return ArchivedRecord(
+        source=model.__name__,
+        original_id=row.pk,
+        owner_id=getattr(row, owner_attname),
+        recorded_at=getattr(row, time_field),
+        data=data,
+    )
+
+
+def archive_model(model, months, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Переносит строки model старше months месяцев в ArchivedRecord пачками по
+    batch_size: каждая пачка - отдельная короткая транзакция (вставка в архив и
+    удаление из основной таблицы), поэтому первый запуск на большой таблице не
+    держит длинных блокировок и его можно прервать. Возвращает число строк.
+    """
+    _, time_field, _ = ARCHIVED_MODELS[model]
+    cutoff = timezone.now() - relativedelta(months=months)
+    # По pk, а не по времени: старые строки лежат в начале индекса первичного ключа
+    expired = model.objects.filter(**{f"{time_field}__lt": cutoff}).order_by("pk")
+
+    moved = 0
+    while True:
+        with transaction.atomic():
+            batch = list(expired.select_for_update(skip_locked=True)[:batch_size])
+            if batch:
+                ArchivedRecord.objects.bulk_create([_to_archive(model, row) for row in batch])
+                model.objects.filter(pk__in=[row.pk for row in batch]).delete()
+        moved += len(batch)
+        if len(batch) < batch_size:
+            return moved
+
+
+def purge_model(model, months, batch_size=ARCHIVE_BATCH_SIZE):
+    """Удаляет строки model старше months месяцев пачками по batch_size (как archive_model). Возвращает число строк."""
+    cutoff = timezone.now() - relativedelta(months=months)
+    expired = model.objects.filter(**{f"{PURGED_MODELS[model]}__lt": cutoff}).order_by("pk")
+
+    purged = 0
+    while True:
+        with transaction.atomic():
+            batch = list(expired.select_for_update(skip_locked=True).values_list("pk", flat=True)[:batch_size])
+            if batch:
+                model.objects.filter(pk__in=batch).delete()
+        purged += len(batch)
+        if len(batch) < batch_size:
+            return purged
+
+
+def archive_old_records(batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Архивирует все таблицы ARCHIVED_MODELS и чистит PURGED_MODELS по
+    retention_policy(). Возвращает {имя модели: перенесено или удалено строк}.
+    """
+    policy = retention_policy()
+    result = {}
+    for models, handle, action in ((ARCHIVED_MODELS, archive_model, "В архив перенесено"),
+                                   (PURGED_MODELS, purge_model, "Удалено")):
+        for model in models:
+            months = policy.get(model.__name__)
+            if months is None:
+                continue
+            result[model.__name__] = handle(model, months, batch_size)
+            if result[model.__name__]:
+                logger.info("%s %s строк %s", action, result[model.__name__], model.__name__)
+    return result
+
+
+def archived_queryset(model, owner_ids=None, **data_filters):
+    """Архивные строки model (по убыванию времени); data_filters - по полям исходной строки."""
+    queryset = ArchivedRecord.objects.filter(source=model.__name__)
+    if owner_ids is not None:
+        queryset = queryset.filter(owner_id__in=owner_ids)
+    for field, value in data_filters.items():
+        queryset = queryset.filter(**{f"data__{field}": value})
+    return queryset.order_by("-recorded_at", "-original_id")
+
+
+def restore(model, records):
+    """
+    Несохранённые экземпляры model из архивных строк - чтобы отдавать их теми же
+    сериализаторами, что и живые. Связи из ARCHIVED_MODELS подгружаются одним
+    запросом на связь, а не по одному на строку.
+    """
+    owner_field, time_field, related = ARCHIVED_MODELS[model]
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    instances = []
+    for record in records:
+        values = {attname: fields[attname].to_python(value) for attname, value in record.data.items() if attname in fields}
+        instance = model(id=record.original_id, **values)
+        setattr(instance, model._meta.get_field(owner_field).attname, record.owner_id)
+        setattr(instance, time_field, record.recorded_at)
+        instances.append(instance)
+
+    for name in related:
+        field = model._meta.get_field(name)
+        ids = {getattr(instance, field.attname) for instance in instances} - {None}
+        objects = field.related_model._default_manager.in_bulk(ids)
+        for instance in instances:
+            setattr(instance, name, objects.get(getattr(instance, field.attname)))
+    return instances
+
+
+class WithArchived:
+    """
+    Живые строки и их архивные копии одной последовательностью по убыванию
+    времени - для Paginator и срезов. Срез [a:b] читает не больше b строк из
+    каждой части и сливает их, так что первые страницы не тянут весь архив.
+    """
+
+    def __init__(self, queryset, archived):
+        self.queryset = queryset
+        self.archived = archived
+        self.model = queryset.model
+
+    def count(self):
+        return self.queryset.count() + self.archived.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        live = list(self.queryset[:stop])
+        archived = restore(self.model, self.archived[:stop])
+        time_field = ARCHIVED_MODELS[self.model][1]
+        merged = heapq.merge(live, archived, key=lambda row: getattr(row, time_field), reverse=True)
+        return list(merged)[start:stop]
+
+    def __iter__(self):
+        return iter(self[:])
+
+
+def delete_archived_for(owner_field, owner_ids):
+    """Удаляет архив владельцев ("event", "client" или "worker") - вместе с ними самими."""
+    sources = [model.__name__ for model, (owner, _, _) in ARCHIVED_MODELS.items() if owner == owner_field]
+    ArchivedRecord.objects.filter(source__in=sources, owner_id__in=list(owner_ids)).delete()
+
+
+def reassign_archived(owner_field, owner_ids, new_owner_id):
+    """Передаёт архив владельцев owner_ids владельцу new_owner_id (при объединении клиентов)."""
+    sources = [model.__name__ for model, (owner, _, _) in ARCHIVED_MODELS.items() if owner == owner_field]
+    ArchivedRecord.objects.filter(source__in=sources, owner_id__in=list(owner_ids)).update(owner_id=new_owner_id)
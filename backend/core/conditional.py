@@ -0,0 +1,67 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def compute_validator(request, *querysets, versions=None, extra=None):
+    """
+    Дешёвый валидатор для условного GET: по каждому queryset - max(updated_at)
+    и количество строк одним агрегатом, плюс полный путь запроса (фильтры,
+    страница, fields/expand). Если ни одна строка не менялась, не добавлялась
+    и не удалялась, ETag совпадёт и сериализацию можно пропустить.
+
+    versions - пары (id, updated_at) уже выбранных строк ответа (страница
+    списка): их версии берутся без запроса к БД, а querysets тогда должны
+    покрывать только вложенные связи этих строк, чтобы стоимость валидатора
+    зависела от размера страницы, а не от всей таблицы.
+
+    Возвращает (etag, last_modified).
+    """
+    parts = [request.get_full_path()]
+    last_modified = None
+    if versions is not None:
+        parts.append(";".join(f"{pk}@{updated_at.isoformat()}" for pk, updated_at in versions))
+        last_modified = max((updated_at for _, updated_at in versions), default=None)
+    for queryset in querysets:
+        aggregate = queryset.order_by().aggregate(last=Max("updated_at"), count=Count("pk"))
+        last = aggregate["last"]
+        parts.append(f"{queryset.model._meta.label}:{aggregate['count']}:{last.isoformat() if last else ''}")
+        if last and (last_modified is None or last > last_modified):
+            last_modified = last
+    if extra is not None:
+        parts.append(str(extra))
+
+    etag = '"%s"' % hashlib.md5("|".join(parts).encode()).hexdigest()
+    return etag, last_modified
+
+
+def page_validator(request, paginator, versions, *querysets):
+    """
+    Валидатор страницы списка: версии её строк, агрегаты по их вложенным
+    связям (querysets) и то, что пагинатор добавляет в ответ - count и ссылки.
+    """
+    page = getattr(paginator, "page", None)
+    count = getattr(getattr(page, "paginator", None), "count", None)
+    extra = (count, paginator.get_next_link(), paginator.get_previous_link())
+    return compute_validator(request, *querysets, versions=versions, extra=extra)
+
+
+def not_modified_response(request, validator):
+    """304 Not Modified, если If-None-Match совпал с текущим ETag, иначе None."""
+    etag, _ = validator
+    # Сравниваем только по ETag: Last-Modified имеет точность до секунды и
+    # пропустил бы изменение, сделанное в ту же секунду.
+    return get_conditional_response(request, etag=etag)
+
+
+def with_validator(response, validator):
+    """Проставляет ETag/Last-Modified и просит браузер всегда перепроверять кэш."""
+    etag, last_modified = validator
+    if response.status_code == 200:
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        response["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,169 @@
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .archive import reassign_archived
+from .deletion import delete_clients
+from .models import Client, ClientHistory, Event, JobProgress, PhoneClient
+
+# Имя строки JobProgress с последним обработанным phone_digits - с него
+# следующий запуск продолжит поиск дубликатов
+DEDUP_PROGRESS_NAME = "client_dedup"
+
+
+def _load_progress():
+    return JobProgress.objects.filter(name=DEDUP_PROGRESS_NAME).values_list("position", flat=True).first() or ""
+
+
+def _save_progress(after):
+    JobProgress.objects.update_or_create(name=DEDUP_PROGRESS_NAME, defaults={"position": after})
+
+
+def _duplicate_phone_batch(after, batch_size):
+    """Следующие batch_size нормализованных номеров (> after), которые есть у нескольких клиентов."""
+    return list(
+        PhoneClient.objects.exclude(phone_digits="")
+        .filter(phone_digits__gt=after)
+        .values("phone_digits")
+        .annotate(clients=Count("client", distinct=True))
+        .filter(clients__gt=1)
+        .order_by("phone_digits")
+        .values_list("phone_digits", flat=True)[:batch_size]
+    )
+
+
+def _group_clients(rows):
+    """
+    Объединяет клиентов с общими номерами в группы (транзитивно: если у A и B
+    общий один номер, а у B и C - другой, все трое - один клиент).
+    """
+    parent = {}
+
+    def find(client_id):
+        parent.setdefault(client_id, client_id)
+        while parent[client_id] != client_id:
+            parent[client_id] = parent[parent[client_id]]
+            client_id = parent[client_id]
+        return client_id
+
+    by_digits = {}
+    for digits, client_id in rows:
+        by_digits.setdefault(digits, set()).add(client_id)
+    for client_ids in by_digits.values():
+        first, *rest = sorted(client_ids)
+        for client_id in rest:
+            parent[find(client_id)] = find(first)
+
+    groups = {}
+    for client_id in parent:
+        groups.setdefault(find(client_id), []).append(client_id)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+@transaction.atomic
+def merge_clients(target_id, duplicate_ids):
+    """
+    Переносит всё, что принадлежит клиентам duplicate_ids, на клиента target_id и
+    удаляет дубликаты. Мероприятия и история переносятся UPDATE-ами целиком, а
+    телефоны, которые у целевого клиента уже есть (по phone_digits), удаляются.
+    Возвращает число перенесённых мероприятий.
+    """
+    from .middleware import get_current_user
+    from .signals import mute_phone_signals
+
+    target = Client.objects.select_for_update().get(pk=target_id)
+    duplicates = list(Client.objects.select_for_update().filter(pk__in=duplicate_ids).exclude(pk=target_id))
+    if not duplicates:
+        return 0
+    duplicate_ids = [client.pk for client in duplicates]
+
+    known_digits = set(PhoneClient.objects.filter(client_id=target_id).values_list("phone_digits", flat=True))
+    phones_to_move = []
+    phones_to_delete = []
+    for phone_id, digits in (
+        PhoneClient.objects.filter(client_id__in=duplicate_ids).order_by("id").values_list("id", "phone_digits")
+    ):
+        if digits in known_digits:
+            phones_to_delete.append(phone_id)
+        else:
+            known_digits.add(digits)
+            phones_to_move.append(phone_id)
+
+    now = timezone.now()
+    with mute_phone_signals():
+        PhoneClient.objects.filter(pk__in=phones_to_delete).delete()
+        PhoneClient.objects.filter(pk__in=phones_to_move).update(client_id=target_id, updated_at=now)
+    moved_events = Event.objects.filter(client_id__in=duplicate_ids).update(client_id=target_id, updated_at=now)
+    ClientHistory.objects.filter(client_id__in=duplicate_ids).update(client_id=target_id)
+    # Архивная история тоже переходит к целевому клиенту, иначе delete_clients удалит её вместе с дубликатами
+    reassign_archived("client", duplicate_ids, target_id)
+
+    user = get_current_user()
+    ClientHistory.objects.bulk_create([
+        ClientHistory(
+            client=target,
+            field_name="merged_client",
+            old_value=None,
+            new_value=f"{client} (#{client.pk})",
+            changed_by=user,
+        )
+        for client in duplicates
+    ])
+    if any(client.is_vip for client in duplicates) and not target.is_vip:
+        target.is_vip = True
+    if not target.name:
+        target.name = next((client.name for client in duplicates if client.name), None)
+    # save() обновит updated_at и через сигнал сбросит кэш всех мероприятий клиента,
+    # в том числе только что перенесённых
+    target.save()
+
+    delete_clients(duplicate_ids)
+    return moved_events
+
+
+def merge_duplicate_clients(batch_size=500, dry_run=False, resume=True, stdout=None):
+    """
+    Ищет клиентов-дубликатов по нормализованному номеру телефона и объединяет
+    каждую группу в самого старого клиента (минимальный id).
+
+    Номера просматриваются пачками по batch_size в порядке phone_digits, так что
+    таблица целиком в память не загружается. Каждая группа объединяется в своей
+    транзакции, а после пачки в JobProgress записывается последний обработанный номер:
+    прерванный запуск с resume=True продолжит с этого места. В режиме dry_run
+    ничего не меняется, только печатается отчёт.
+
+    Возвращает {"groups": ..., "clients": ..., "events": ...}.
+    """
+    after = _load_progress() if resume and not dry_run else ""
+    stats = {"groups": 0, "clients": 0, "events": 0}
+
+    while True:
+        digits_batch = _duplicate_phone_batch(after, batch_size)
+        if not digits_batch:
+            break
+        after = digits_batch[-1]
+
+        rows = PhoneClient.objects.filter(phone_digits__in=digits_batch).values_list("phone_digits", "client_id")
+        for group in _group_clients(rows):
+            target_id, *duplicate_ids = group
+            stats["groups"] += 1
+            stats["clients"] += len(duplicate_ids)
+            if dry_run:
+                events = Event.objects.filter(client_id__in=duplicate_ids).count()
+                stats["events"] += events
+                if stdout is not None:
+                    stdout.write(f"Клиент #{target_id} <- {', '.join(f'#{pk}' for pk in duplicate_ids)} (мероприятий: {events})")
+                continue
+            stats["events"] += merge_clients(target_id, duplicate_ids)
+
+        if not dry_run:
+            _save_progress(after)
+
+    if not dry_run:
+        JobProgress.objects.filter(name=DEDUP_PROGRESS_NAME).delete()
+    if stdout is not None:
+        prefix = "Найдено" if dry_run else "Объединено"
+        stdout.write(
+            f"{prefix}: групп {stats['groups']}, дубликатов {stats['clients']}, мероприятий {stats['events']}"
+        )
+    return stats
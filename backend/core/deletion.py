@@ -0,0 +1,65 @@
+from django.db import connection, transaction
+
+from .archive import delete_archived_for
+from .event_cache import invalidate_event_payloads
+from .models import Client, Event, EventTombstone
+
+
+def _db_cascade_supported():
+    # ON DELETE CASCADE добавляет миграция 0018 только в PostgreSQL
+    return connection.vendor == "postgresql"
+
+
+def _delete_returning_ids(model, ids):
+    """Один DELETE; связанные строки удаляет сама БД (ON DELETE CASCADE)."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{model._meta.db_table}" WHERE id = ANY(%s) RETURNING id', [list(ids)])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _after_events_deleted(event_ids):
+    # Сигналы по строкам при этом не срабатывают - отметки для дельта-синхронизации
+    # и сброс кэша делаем сами, по одному запросу на все мероприятия
+    EventTombstone.objects.bulk_create([EventTombstone(event_id=event_id) for event_id in event_ids])
+    delete_archived_for("event", event_ids)
+    invalidate_event_payloads(event_ids)
+
+
+@transaction.atomic
+def delete_events(event_ids):
+    """
+    Быстрое удаление мероприятий вместе с устройствами, связями с работниками,
+    историей и логами: один DELETE (плюс один - по архиву) и одна вставка
+    отметок об удалении, без загрузки связанных строк в память и сигналов на
+    каждую строку.
+    Возвращает число удалённых мероприятий.
+    """
+    event_ids = list(event_ids)
+    if not event_ids:
+        return 0
+    if not _db_cascade_supported():
+        return Event.objects.filter(pk__in=event_ids).delete()[1].get(Event._meta.label, 0)
+
+    deleted_ids = _delete_returning_ids(Event, event_ids)
+    _after_events_deleted(deleted_ids)
+    return len(deleted_ids)
+
+
+@transaction.atomic
+def delete_clients(client_ids):
+    """
+    Быстрое удаление клиентов вместе с телефонами, историей и всеми их
+    мероприятиями (см. delete_events) за несколько запросов независимо от
+    размера клиента. Возвращает число удалённых клиентов.
+    """
+    client_ids = list(client_ids)
+    if not client_ids:
+        return 0
+    if not _db_cascade_supported():
+        return Client.objects.filter(pk__in=client_ids).delete()[1].get(Client._meta.label, 0)
+
+    event_ids = list(Event.objects.filter(client_id__in=client_ids).values_list("pk", flat=True))
+    deleted_ids = _delete_returning_ids(Client, client_ids)
+    delete_archived_for("client", deleted_ids)
+    _after_events_deleted(event_ids)
+    return len(deleted_ids)
@@ -0,0 +1,112 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .serializers import EventFastReadSerializer
+
+# Меняется вместе со структурой EventSerializer - старые записи кэша просто перестают читаться.
+EVENT_PAYLOAD_VERSION = 1
+# Большинство мероприятий после даты свадьбы больше не редактируются, поэтому
+# держим долго: актуальность обеспечивают сигналы (см. core/signals.py), а не TTL.
+EVENT_PAYLOAD_TIMEOUT = 60 * 60 * 24
+
+
+def event_generation_key(event_id):
+    return f"event_payload_gen:{event_id}"
+
+
+def event_payload_key(event_id, generation, updated_at):
+    """
+    Ключ представления мероприятия. Поколение меняется при каждом сбросе, а
+    updated_at - при каждом изменении строки, поэтому запись, собранная из данных
+    до коммита, ложится под ключ, который после коммита уже никто не читает.
+    """
+    return f"event_payload:v{EVENT_PAYLOAD_VERSION}:{event_id}:{generation}:{updated_at.isoformat()}"
+
+
+def new_generations(event_ids):
+    generations = {event_generation_key(event_id): uuid4().hex for event_id in event_ids}
+    # Без TTL: потерянное поколение создаётся заново (см. event_generations)
+    cache.set_many(generations, None)
+    return generations
+
+
+def event_generations(event_ids):
+    """Текущие поколения мероприятий {id: поколение}; отсутствующие создаются."""
+    keys = {event_id: event_generation_key(event_id) for event_id in event_ids}
+    generations = cache.get_many(list(keys.values()))
+    missing = [event_id for event_id, key in keys.items() if key not in generations]
+    if missing:
+        generations.update(new_generations(missing))
+    return {event_id: generations[key] for event_id, key in keys.items()}
+
+
+def invalidate_event_payloads(event_ids):
+    """
+    Сбрасывает закэшированные представления мероприятий: после коммита выдаёт им
+    новые поколения. Старые записи никто больше не читает, они истекают по TTL.
+    Сбрасываем после коммита: если раньше, параллельный запрос успеет положить в
+    кэш ещё старые данные под новым поколением.
+    """
+    event_ids = {event_id for event_id in event_ids if event_id is not None}
+    if event_ids:
+        transaction.on_commit(lambda: new_generations(event_ids))
+
+
+def touch_devices(devices):
+    """
+    Отмечает устройства изменёнными: updated_at и сброс кэша их мероприятий. Для
+    изменений, которые видны в devices[].workers, но не трогают саму строку Device
+    (порядок работников, удаление работника) - иначе их не заметят ни условный
+    GET (ETag по updated_at), ни дельта-синхронизация (?updated_since).
+    """
+    event_ids = set(devices.values_list("event_id", flat=True))
+    if event_ids:
+        devices.update(updated_at=timezone.now())
+        invalidate_event_payloads(event_ids)
+
+
+class CachedEventReadSerializer:
+    """
+    EventFastReadSerializer с кэшем готового представления каждого мероприятия.
+
+    Страница собирается двумя cache.get_many (поколения, затем представления),
+    сериализуются только промахи (и сразу кладутся в кэш одним set_many). В кэше
+    всегда полное представление, ?fields/?expand применяются уже к нему.
+
+    Вложенные связи промахов читаются после чтения поколений: если запись
+    закоммитилась между ними, её сброс уже сменил поколение и устаревшее
+    представление ляжет под ключ, который больше никто не прочитает.
+    """
+
+    def __init__(self, instance, many=True, fields=None, expand=None):
+        self.rows = list(instance)
+        self.fields = fields
+        self.expand = expand
+
+    @property
+    def data(self):
+        if not self.rows:
+            return []
+
+        generations = event_generations([row["id"] for row in self.rows])
+        keys = {
+            row["id"]: event_payload_key(row["id"], generations[row["id"]], row["updated_at"]) for row in self.rows
+        }
+        cached = cache.get_many(list(keys.values()))
+
+        missing = [row for row in self.rows if keys[row["id"]] not in cached]
+        if missing:
+            fresh = EventFastReadSerializer(missing, many=True).data
+            fresh_by_key = {keys[item["id"]]: item for item in fresh}
+            cache.set_many(fresh_by_key, EVENT_PAYLOAD_TIMEOUT)
+            cached.update(fresh_by_key)
+
+        payloads = [cached[keys[row["id"]]] for row in self.rows]
+        if self.fields is None and self.expand is None:
+            return payloads
+
+        field_names = EventFastReadSerializer([], fields=self.fields, expand=self.expand).field_names
+        return [{name: payload[name] for name in field_names} for payload in payloads]
@@ -0,0 +1,75 @@
+import logging
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+
+def _active_buffer():
+    return getattr(_state, "buffer", None)
+
+
+def _collect(buffer, entries):
+    for entry in entries:
+        buffer.setdefault(type(entry), []).append(entry)
+
+
+def _flush(buffer):
+    """Одна вставка на таблицу истории. Данные к этому моменту уже закоммичены,
+    поэтому ошибку только логируем - ответ клиенту от неё не должен стать 500."""
+    for model, entries in buffer.items():
+        try:
+            model.objects.bulk_create(entries)
+        except Exception:
+            logger.exception("Не удалось записать историю изменений (%s, %s записей)", model.__name__, len(entries))
+    buffer.clear()
+
+
+def record_history(entries):
+    """
+    Записывает строки истории (EventHistory, ClientHistory и т.п.).
+
+    Внутри history_buffer() строка попадает в буфер только после коммита
+    транзакции, в которой произошло изменение: если транзакция (или точка
+    сохранения) откатится, Django отбросит on_commit-колбэк, и строка в историю
+    не попадёт. Без буфера строки вставляются сразу, в текущей транзакции.
+    """
+    entries = list(entries)
+    if not entries:
+        return
+    buffer = _active_buffer()
+    if buffer is None:
+        grouped = {}
+        _collect(grouped, entries)
+        for model, rows in grouped.items():
+            model.objects.bulk_create(rows)
+        return
+    transaction.on_commit(partial(_collect, buffer, entries))
+
+
+@contextmanager
+def history_buffer():
+    """
+    Копит историю изменений за весь блок (обычно - за HTTP-запрос, см.
+    HistoryBufferMiddleware) и пишет её одним bulk_create на таблицу.
+
+    Запись регистрируется через on_commit при выходе из блока - после колбэков
+    всех строк, добавленных внутри, поэтому сюда доходят только строки
+    закоммиченных транзакций. Вложенные блоки пишут в буфер внешнего.
+    """
+    if _active_buffer() is not None:
+        yield
+        return
+
+    buffer = {}
+    _state.buffer = buffer
+    try:
+        yield
+    finally:
+        _state.buffer = None
+        transaction.on_commit(partial(_flush, buffer))
@@ -0,0 +1,77 @@
+import functools
+import hashlib
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# Сколько помним успешный ответ: повтор с тем же ключом в этом окне не выполняется заново
+IDEMPOTENCY_TTL = 60 * 60 * 24
+# Сколько держим отметку "запрос выполняется" (отправка в Telegram может идти долго)
+IDEMPOTENCY_LOCK_TIMEOUT = 120
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def _cache_key(request, key):
+    scope = f"{request.user.pk}:{request.method}:{request.path}:{key}"
+    return "idempotency:" + hashlib.sha256(scope.encode()).hexdigest()
+
+
+def idempotent(view):
+    """
+    Повтор запроса с тем же заголовком Idempotency-Key отдаёт сохранённый ответ,
+    не выполняя вьюху ещё раз (не создаёт второе мероприятие, не отправляет
+    повторно сообщение в Telegram).
+
+    Ключ действует в рамках пользователя, метода и пути. Сохраняются только
+    успешные (2xx) ответы - после ошибки тот же ключ можно отправить снова.
+    Пока первый запрос выполняется, повтор получает 409; тот же ключ с другим
+    телом запроса - 422. Без заголовка вьюха работает как обычно.
+    Для методов APIView - через method_decorator(idempotent).
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view(request, *args, **kwargs)
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return Response(
+                {"detail": f"{IDEMPOTENCY_HEADER} не длиннее {IDEMPOTENCY_KEY_MAX_LENGTH} символов."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache_key = _cache_key(request, key)
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+
+        stored = cache.get(cache_key)
+        if stored is None:
+            if not cache.add(f"{cache_key}:lock", fingerprint, IDEMPOTENCY_LOCK_TIMEOUT):
+                return Response(
+                    {"detail": f"Запрос с этим {IDEMPOTENCY_HEADER} ещё выполняется."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            try:
+                # Первый запрос мог сохранить ответ и снять блокировку между нашими
+                # cache.get и cache.add - тогда отдаём его ответ, а не выполняем вьюху снова
+                stored = cache.get(cache_key)
+                if stored is None:
+                    response = view(request, *args, **kwargs)
+                    if status.is_success(response.status_code):
+                        stored = {"fingerprint": fingerprint, "status": response.status_code, "data": response.data}
+                        cache.set(cache_key, stored, IDEMPOTENCY_TTL)
+                    return response
+            finally:
+                cache.delete(f"{cache_key}:lock")
+
+        if stored["fingerprint"] != fingerprint:
+            return Response(
+                {"detail": f"{IDEMPOTENCY_HEADER} уже использован для другого запроса."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        response = Response(stored["data"], status=stored["status"])
+        response["Idempotent-Replayed"] = "true"
+        return response
+
+    return wrapper
@@ -0,0 +1,180 @@
+import csv
+import io
+import json
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .models import Client, Device, Event, EventLog, PhoneClient, Service, Workers
+from .serializers import ImportEventSerializer
+
+# Сколько строк валидируем и вставляем за раз
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Колонки CSV, которые относятся к клиенту, мероприятию и устройству.
+# Строки с одинаковым непустым "contract", идущие подряд, - одно мероприятие
+# с несколькими устройствами (как в таблице: строка на каждую услугу).
+CSV_CLIENT_COLUMNS = {"client_name": "name", "is_vip": "is_vip"}
+CSV_EVENT_COLUMNS = ("computer_numbers", "amount", "amount_money", "advance", "advance_money", "comment")
+CSV_DEVICE_COLUMNS = {
+    "service": "service",
+    "camera_count": "camera_count",
+    "restaurant_name": "restaurant_name",
+    "device_comment": "comment",
+    "event_service_date": "event_service_date",
+}
+CSV_LIST_SEPARATOR = ";"
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+
+
+def _csv_device(row):
+    device = {field: row[column] for column, field in CSV_DEVICE_COLUMNS.items() if row.get(column)}
+    if not device:
+        return None
+    if row.get("workers"):
+        device["workers"] = _split_list(row["workers"])
+    return device
+
+
+def _iter_csv(text):
+    """(номер строки, данные мероприятия) из CSV; пустые ячейки считаются незаполненными."""
+    reader = csv.DictReader(text)
+    current_key = current_line = current = None
+    for row in reader:
+        row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+        device = _csv_device(row)
+        key = row.get("contract")
+        if current is not None and key and key == current_key:
+            if device:
+                current["devices"].append(device)
+            continue
+
+        if current is not None:
+            yield current_line, current
+        client = {field: row[column] for column, field in CSV_CLIENT_COLUMNS.items() if row.get(column)}
+        client["phones"] = [{"phone_number": phone} for phone in _split_list(row.get("phones", ""))]
+        current = {column: row[column] for column in CSV_EVENT_COLUMNS if row.get(column)}
+        current["client"] = client
+        current["devices"] = [device] if device else []
+        current_key, current_line = key, reader.line_num
+    if current is not None:
+        yield current_line, current
+
+
+def _iter_jsonl(text):
+    """(номер строки, данные мероприятия) из JSON Lines - каждая строка как тело POST /events/."""
+    for line_number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as error:
+            yield line_number, error
+
+
+def _iter_batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _load_batch(items):
+    """
+    Вставляет пачку провалидированных мероприятий: по одному bulk_create на
+    клиентов, телефоны, мероприятия, логи, устройства и связи устройство-работник.
+    Сигналы при bulk_create не срабатывают, поэтому лог создания пишем сами.
+    """
+    clients = Client.objects.bulk_create([
+        Client(name=item["client"].get("name"), is_vip=item["client"]["is_vip"]) for item in items
+    ])
+    PhoneClient.objects.bulk_create([
+        PhoneClient(client=client, phone_number=phone["phone_number"]).fill_phone_digits()
+        for client, item in zip(clients, items)
+        for phone in item["client"]["phones"]
+    ])
+
+    event_fields = ("computer_numbers", "amount", "amount_money", "advance", "advance_money", "comment")
+    events = Event.objects.bulk_create([
+        Event(client=client, **{field: item.get(field) for field in event_fields})
+        for client, item in zip(clients, items)
+    ])
+    EventLog.objects.bulk_create([
+        EventLog(event=event, message=f"Создано мероприятие с инвойсом на {event.amount} сум.") for event in events
+    ])
+
+    devices = []
+    device_workers = []
+    for event, item in zip(events, items):
+        for device_data in item["devices"]:
+            device_data = dict(device_data)
+            device_workers.append(device_data.pop("workers"))
+            devices.append(Device(event=event, service_id=device_data.pop("service"), **device_data))
+    Device.objects.bulk_create(devices)
+
+    Through = Device.workers.through
+    Through.objects.bulk_create([
+        Through(device_id=device.pk, workers_id=worker_id)
+        for device, worker_ids in zip(devices, device_workers)
+        for worker_id in worker_ids
+    ])
+    return len(events)
+
+
+def import_events(file, file_format, batch_size=IMPORT_BATCH_SIZE, skip_invalid=False):
+    """
+    Импорт мероприятий вместе с клиентами, телефонами и устройствами из CSV или
+    JSON Lines (file - бинарный файл в UTF-8).
+
+    Строки валидируются пачками по batch_size (id услуг и работников загружаются
+    один раз на весь импорт) и вставляются крупными bulk_create внутри одной
+    транзакции. Если в файле есть ошибки, по умолчанию не импортируется ничего;
+    с skip_invalid=True загружаются только корректные строки.
+
+    Возвращает {"created": ..., "errors": [{"row": ..., "errors": ...}], "committed": ...}.
+    """
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат импорта: {file_format}")
+
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    rows = _iter_csv(text) if file_format == "csv" else _iter_jsonl(text)
+    context = {
+        "service_ids": set(Service.objects.values_list("pk", flat=True)),
+        "worker_ids": set(Workers.objects.values_list("pk", flat=True)),
+    }
+
+    # Один экземпляр на все строки, как у ListSerializer: поля сериализатора
+    # строятся один раз, а не заново для каждой строки
+    serializer = ImportEventSerializer(context=context)
+
+    created = 0
+    errors = []
+    with transaction.atomic():
+        for batch in _iter_batches(rows, batch_size):
+            valid = []
+            for row_number, data in batch:
+                if isinstance(data, Exception):
+                    errors.append({"row": row_number, "errors": {"detail": f"Некорректный JSON: {data}"}})
+                    continue
+                try:
+                    valid.append(serializer.run_validation(data))
+                except serializers.ValidationError as error:
+                    errors.append({"row": row_number, "errors": error.detail})
+            if valid and (skip_invalid or not errors):
+                created += _load_batch(valid)
+
+        committed = skip_invalid or not errors
+        if not committed:
+            transaction.set_rollback(True)
+            created = 0
+
+    return {"created": created, "errors": errors, "committed": committed}
@@ -0,0 +1,23 @@
+from django.db.models import CharField, TextField
+from django.db.models.lookups import IContains
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class ILikeContains(IContains):
+    """
+    Регистронезависимый поиск подстроки, который в PostgreSQL компилируется в
+    "name ILIKE '%...%'" без UPPER(): такое условие обслуживает GIN-индекс
+    gin_trgm_ops по самой колонке, а UPPER("name"::text) LIKE UPPER(...) от
+    icontains - нет. В остальных БД работает как обычный icontains.
+    """
+
+    lookup_name = "ilike_contains"
+
+    def as_sql(self, compiler, connection):
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*lhs_params, *rhs_params)
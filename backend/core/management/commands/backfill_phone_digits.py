@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.models import PhoneClient, TelegramAdvanceNotificationLog, TelegramContractLog, WorkerNotificationLog, Workers
+from core.phones import backfill_phone_digits
+
+
+class Command(BaseCommand):
+    help = "Пачками пересчитывает phone_digits у всех моделей с номерами телефонов."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for model in (PhoneClient, Workers, TelegramContractLog, TelegramAdvanceNotificationLog, WorkerNotificationLog):
+            backfill_phone_digits(model, model.phone_source_field, options["batch_size"], stdout=self.stdout)
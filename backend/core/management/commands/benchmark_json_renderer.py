@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Event
+from core.renderers import ORJSONRenderer
+from core.serializers import EventFastReadSerializer
+
+
+class Command(BaseCommand):
+    help = "Сравнивает время кодирования ответа /events/ стандартным JSONRenderer и ORJSONRenderer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=5000, help="Сколько мероприятий взять из БД")
+        parser.add_argument("--repeat", type=int, default=10, help="Сколько раз кодировать payload")
+        parser.add_argument(
+            "--multiply", type=int, default=1,
+            help="Размножить payload N раз (если в БД мало данных)",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.order_by("-created_at", "id").values(*EventFastReadSerializer.event_values)
+        data = EventFastReadSerializer(events[:options["limit"]], many=True).data * options["multiply"]
+        if not data:
+            self.stdout.write(self.style.WARNING("В БД нет мероприятий - нечего кодировать."))
+            return
+
+        results = {}
+        for name, renderer in (("JSONRenderer", JSONRenderer()), ("ORJSONRenderer", ORJSONRenderer())):
+            started = time.perf_counter()
+            for _ in range(options["repeat"]):
+                body = renderer.render(data)
+            elapsed = (time.perf_counter() - started) / options["repeat"]
+            results[name] = elapsed
+            self.stdout.write(f"{name:>15}: {elapsed * 1000:.2f} мс на ответ ({len(body) / 1024:.0f} КБ)")
+
+        speedup = results["JSONRenderer"] / results["ORJSONRenderer"]
+        self.stdout.write(self.style.SUCCESS(f"{len(data)} мероприятий, orjson быстрее в {speedup:.1f} раз"))
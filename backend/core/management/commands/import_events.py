@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importer import IMPORT_BATCH_SIZE, IMPORT_FORMATS, import_events
+
+
+class Command(BaseCommand):
+    help = "Импортирует мероприятия с клиентами и устройствами из CSV или JSON Lines одной транзакцией."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="По умолчанию - по расширению файла")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument("--skip-invalid", action="store_true", help="Загрузить корректные строки, пропустив ошибочные")
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or options["path"].rsplit(".", 1)[-1].lower()
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError(f"Поддерживаемые форматы: {', '.join(IMPORT_FORMATS)}")
+
+        with open(options["path"], "rb") as file:
+            result = import_events(file, file_format, options["batch_size"], options["skip_invalid"])
+
+        for error in result["errors"]:
+            self.stderr.write(f"Строка {error['row']}: {error['errors']}")
+        if not result["committed"]:
+            raise CommandError(f"Ошибок: {len(result['errors'])}, ничего не импортировано")
+        self.stdout.write(f"Импортировано мероприятий: {result['created']}, пропущено строк: {len(result['errors'])}")
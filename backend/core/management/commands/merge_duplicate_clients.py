@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.dedup import merge_duplicate_clients
+
+
+class Command(BaseCommand):
+    help = "Находит клиентов с одинаковым номером телефона и объединяет их в одного."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Только показать найденные дубликаты")
+        parser.add_argument("--restart", action="store_true", help="Начать сначала, а не с сохранённого места")
+
+    def handle(self, *args, **options):
+        merge_duplicate_clients(
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+            resume=not options["restart"],
+            stdout=self.stdout,
+        )
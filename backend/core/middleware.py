@@ -1,5 +1,7 @@
 import threading
 
+from .history import history_buffer
+
 _thread_locals = threading.local()
 
 
@@ -32,3 +34,18 @@ class CurrentUserMiddleware:
         finally:
             _thread_locals.request = None
         return response
+
+
+class HistoryBufferMiddleware:
+    """
+    Собирает историю изменений (EventHistory, ClientHistory) за весь запрос и пишет
+    её одной вставкой на таблицу после коммита, а не отдельным INSERT на каждое
+    сохранение. История откатившихся транзакций в буфер не попадает.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with history_buffer():
+            return self.get_response(request)
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_enforce_contract_token_unique"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["event_service_date", "event"],
+                name="core_device_event_s_88af99_idx",
+            ),
+        ),
+    ]
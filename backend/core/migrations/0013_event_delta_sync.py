@@ -0,0 +1,62 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_device_event_service_date_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("event_id", models.BigIntegerField(db_index=True)),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "ordering": ["-deleted_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="advancehistory",
+            index=models.Index(
+                fields=["updated_at"], name="core_advanc_updated_f07fc9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(
+                fields=["updated_at"], name="core_client_updated_c9d030_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["updated_at"], name="core_device_updated_59047b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["updated_at"], name="core_event_updated_955fe2_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="phoneclient",
+            index=models.Index(
+                fields=["updated_at"], name="core_phonec_updated_c9b482_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:14
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_event_delta_sync"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="client",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="core_client_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="phoneclient",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["phone_number"],
+                name="core_phone_number_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
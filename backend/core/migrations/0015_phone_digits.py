@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_client_trigram_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="phoneclient",
+            name="phone_digits",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=15
+            ),
+        ),
+        migrations.AddField(
+            model_name="telegramadvancenotificationlog",
+            name="phone_digits",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=15
+            ),
+        ),
+        migrations.AddField(
+            model_name="telegramcontractlog",
+            name="phone_digits",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=15
+            ),
+        ),
+        migrations.AddField(
+            model_name="workernotificationlog",
+            name="phone_digits",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=15
+            ),
+        ),
+        migrations.AddField(
+            model_name="workers",
+            name="phone_digits",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=15
+            ),
+        ),
+    ]
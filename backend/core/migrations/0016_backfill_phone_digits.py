@@ -0,0 +1,74 @@
+import re
+
+from django.db import migrations, transaction
+
+# Копия правил core.phones.normalize_phone_digits на момент миграции: историческая
+# миграция не должна меняться вместе с кодом приложения
+NON_DIGITS = re.compile(r"\D")
+BATCH_SIZE = 1000
+
+# (модель, поле с исходным номером)
+PHONE_MODELS = [
+    ("PhoneClient", "phone_number"),
+    ("Workers", "phone_number"),
+    ("TelegramContractLog", "phone"),
+    ("TelegramAdvanceNotificationLog", "phone"),
+    ("WorkerNotificationLog", "phone"),
+]
+
+
+def normalize_phone_digits(phone):
+    if not phone:
+        return ""
+    digits = NON_DIGITS.sub("", str(phone))
+    if len(digits) == 9:
+        digits = "998" + digits
+    return digits
+
+
+def backfill_phone_digits(model, source_field):
+    """Пачками по первичному ключу; каждая пачка - отдельная транзакция с одним bulk_update."""
+    last_pk = 0
+    while True:
+        batch = list(
+            model.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .only("pk", source_field, "phone_digits")[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+
+        changed = []
+        for obj in batch:
+            digits = normalize_phone_digits(getattr(obj, source_field))
+            if obj.phone_digits != digits:
+                obj.phone_digits = digits
+                changed.append(obj)
+        if changed:
+            with transaction.atomic():
+                model.objects.bulk_update(changed, ["phone_digits"])
+
+
+def populate_phone_digits(apps, schema_editor):
+    """Пачками заполняем phone_digits у существующих строк (каждая пачка - своя транзакция)."""
+    for model_name, source_field in PHONE_MODELS:
+        backfill_phone_digits(apps.get_model("core", model_name), source_field)
+
+
+def reverse_noop(apps, schema_editor):
+    # Откатывать нечего - поле удалится откатом предыдущей миграции.
+    pass
+
+
+class Migration(migrations.Migration):
+    # Пачки коммитятся по отдельности, чтобы не держать блокировки на всю таблицу логов
+    atomic = False
+
+    dependencies = [
+        ("core", "0015_phone_digits"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_phone_digits, reverse_noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:30
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def raise_amount_to_advance(apps, schema_editor):
+    """
+    Старые договоры, где аванс больше суммы (сумму уменьшили после оплаты).
+    NOT VALID не проверяет их при добавлении ограничения, но PostgreSQL проверяет
+    CHECK при любом UPDATE строки - даже только updated_at или client_id - и такое
+    сохранение падало бы с IntegrityError. Полученные деньги (аванс) не трогаем:
+    поднимаем сумму до аванса и пишем изменение в историю договора.
+    """
+    Event = apps.get_model("core", "Event")
+    EventHistory = apps.get_model("core", "EventHistory")
+
+    broken = list(Event.objects.filter(advance__gt=F("amount")).values_list("pk", "amount", "advance"))
+    if not broken:
+        return
+
+    EventHistory.objects.bulk_create(
+        EventHistory(event_id=pk, field_name="amount", old_value=str(amount), new_value=str(advance))
+        for pk, amount, advance in broken
+    )
+    Event.objects.filter(advance__gt=F("amount")).update(amount=F("advance"), updated_at=timezone.now())
+    print(f"\n  Сумма поднята до аванса у {len(broken)} договоров: {', '.join(str(pk) for pk, _, _ in broken)}")
+
+
+class AddConstraintNotValid(migrations.AddConstraint):
+    """
+    AddConstraint, который в PostgreSQL добавляет CHECK как NOT VALID: таблица не
+    сканируется под блокировкой. Ограничение всё равно проверяется на каждом
+    INSERT и UPDATE, поэтому старые нарушающие строки исправляет предыдущий шаг
+    (raise_amount_to_advance).
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        sql = self.constraint.create_sql(model, schema_editor)
+        schema_editor.execute(f"{sql} NOT VALID")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0016_backfill_phone_digits"),
+    ]
+
+    operations = [
+        migrations.RunPython(raise_amount_to_advance, migrations.RunPython.noop),
+        AddConstraintNotValid(
+            model_name="event",
+            constraint=models.CheckConstraint(
+                check=models.Q(("advance__lte", models.F("amount"))),
+                name="core_event_advance_lte_amount",
+            ),
+        ),
+    ]
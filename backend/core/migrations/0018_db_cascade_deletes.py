@@ -0,0 +1,51 @@
+from django.db import migrations
+
+# (таблица, колонка, родительская таблица): внешние ключи, которые PostgreSQL
+# удаляет сам вместе с родителем (см. core/deletion.py)
+DB_CASCADE_FOREIGN_KEYS = [
+    ("core_phoneclient", "client_id", "core_client"),
+    ("core_clienthistory", "client_id", "core_client"),
+    ("core_event", "client_id", "core_client"),
+    ("core_device", "event_id", "core_event"),
+    ("core_device_workers", "device_id", "core_device"),
+    ("core_advancehistory", "event_id", "core_event"),
+    ("core_eventhistory", "event_id", "core_event"),
+    ("core_eventlog", "event_id", "core_event"),
+    ("core_telegramcontractlog", "event_id", "core_event"),
+    ("core_telegramadvancenotificationlog", "event_id", "core_event"),
+]
+
+
+def _recreate_foreign_keys(schema_editor, on_delete):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        for table, column, parent in DB_CASCADE_FOREIGN_KEYS:
+            constraints = connection.introspection.get_constraints(cursor, table)
+            for name, info in constraints.items():
+                if info["foreign_key"] and info["columns"] == [column]:
+                    schema_editor.execute(
+                        f'ALTER TABLE "{table}" DROP CONSTRAINT "{name}", '
+                        f'ADD CONSTRAINT "{name}" FOREIGN KEY ("{column}") REFERENCES "{parent}" ("id")'
+                        f"{on_delete} DEFERRABLE INITIALLY DEFERRED"
+                    )
+
+
+def add_db_cascade(apps, schema_editor):
+    _recreate_foreign_keys(schema_editor, " ON DELETE CASCADE")
+
+
+def remove_db_cascade(apps, schema_editor):
+    _recreate_foreign_keys(schema_editor, "")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0017_event_advance_lte_amount"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_db_cascade, remove_db_cascade),
+    ]
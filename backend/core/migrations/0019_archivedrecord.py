@@ -0,0 +1,50 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:45
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0018_db_cascade_deletes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=50)),
+                ("original_id", models.BigIntegerField()),
+                ("owner_id", models.BigIntegerField()),
+                ("recorded_at", models.DateTimeField()),
+                (
+                    "data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["source", "owner_id", "-recorded_at"],
+                        name="core_archiv_source_47af36_idx",
+                    ),
+                    models.Index(
+                        fields=["source", "-recorded_at"],
+                        name="core_archiv_source_1d5803_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
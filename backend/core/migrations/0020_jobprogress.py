@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0019_archivedrecord"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("position", models.CharField(blank=True, default="", max_length=255)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -2,10 +2,15 @@ import uuid
 
 from colorfield.fields import ColorField
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import RegexValidator
-from django.db import models
-from django.db.models import CASCADE
+from django.db import connection, models, transaction
+from django.db.models import CASCADE, F, Q
+from django.utils import timezone
+
+from .phones import normalize_phone_digits
 
 
 class BaseModel(models.Model):
@@ -18,7 +23,84 @@ class BaseModel(models.Model):
         abstract = True
 
 
-class PhoneNumber(models.Model):
+class TrackedFieldsMixin(models.Model):
+    """
+    Снимок значений tracked_fields на момент загрузки из БД (from_db) и после
+    каждого save(). По нему сигналы истории (core/signals.py) находят изменения
+    в памяти, без SELECT старой версии перед каждым сохранением.
+    """
+
+    tracked_fields = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._original_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.tracked_fields
+        }
+        return instance
+
+    def get_original_values(self):
+        """Значения tracked_fields из снимка; None, если экземпляр создан без загрузки или поля отложены."""
+        original = getattr(self, "_original_values", None)
+        if original is None or any(name not in original for name in self.tracked_fields):
+            return None
+        return original
+
+    def snapshot_tracked_fields(self, fields=None):
+        original = getattr(self, "_original_values", None) or {}
+        for name in fields or self.tracked_fields:
+            if name in self.tracked_fields:
+                original[name] = getattr(self, name)
+        self._original_values = original
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.snapshot_tracked_fields()
+        else:
+            # update_fields содержит имена полей; для ForeignKey в снимке - attname (client_id)
+            names = {self._meta.get_field(name).attname for name in update_fields}
+            self.snapshot_tracked_fields(names)
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        names = None if fields is None else {self._meta.get_field(name).attname for name in fields}
+        self.snapshot_tracked_fields(names)
+
+
+class PhoneDigitsMixin(models.Model):
+    """
+    Нормализованные цифры номера (E.164 без "+") в отдельном индексированном поле -
+    для обратного поиска по номеру одним обращением к индексу, в каком бы формате
+    номер ни ввёл оператор. Заполняется при save(); bulk_create/bulk_update
+    сигналов и save() не вызывают - там нужно звать fill_phone_digits() вручную.
+    """
+
+    phone_source_field = "phone_number"
+
+    phone_digits = models.CharField(max_length=15, blank=True, default="", db_index=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def fill_phone_digits(self):
+        self.phone_digits = normalize_phone_digits(getattr(self, self.phone_source_field))
+        return self
+
+    def save(self, *args, **kwargs):
+        self.fill_phone_digits()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.phone_source_field in update_fields:
+            kwargs["update_fields"] = {*update_fields, "phone_digits"}
+        super().save(*args, **kwargs)
+
+
+class PhoneNumber(PhoneDigitsMixin):
     """Абстрактная модель для хранения номеров телефонов."""
 
     phone_number = models.CharField(
@@ -35,9 +117,11 @@ class PhoneNumber(models.Model):
         abstract = True
 
 
-class Client(BaseModel):
+class Client(TrackedFieldsMixin, BaseModel):
     """Модель клиента."""
 
+    tracked_fields = ("name",)
+
     name = models.CharField(max_length=255, null=True, blank=True, db_index=True)
     is_vip = models.BooleanField(default=False, db_index=True)
     is_archived = models.BooleanField(default=False, db_index=True)
@@ -46,21 +130,29 @@ class Client(BaseModel):
         indexes = [
             models.Index(fields=['is_archived', 'is_vip']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at']),
+            # Нечёткий поиск по имени (/clients/search/): similarity и ILIKE '%...%'
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='core_client_name_trgm'),
         ]
 
     def __str__(self):
         return self.name or "Без имени"
 
 
-class PhoneClient(PhoneNumber, BaseModel):
+class PhoneClient(TrackedFieldsMixin, PhoneNumber, BaseModel):
     """Модель для хранения телефонов клиента."""
 
+    tracked_fields = ("phone_number",)
+
     client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="phones", db_index=True)
 
     class Meta:
         ordering = ["id"]  # Порядок как при вводе: первый введённый — первый в списке
         indexes = [
             models.Index(fields=['client', 'phone_number']),
+            models.Index(fields=['updated_at']),
+            # Поиск по подстроке цифр номера (/clients/search/)
+            GinIndex(fields=['phone_number'], opclasses=['gin_trgm_ops'], name='core_phone_number_trgm'),
         ]
 
     def __str__(self):
@@ -134,10 +226,21 @@ class Device(BaseModel):
     event = models.ForeignKey("Event", CASCADE, "devices")
     workers = models.ManyToManyField(Workers, related_name="devices", blank=True)
 
+    class Meta:
+        indexes = [
+            # Календарь и уведомления работникам выбирают устройства по диапазону дат
+            models.Index(fields=['event_service_date', 'event']),
+            # Дельта-синхронизация (/events/?updated_since=) ищет изменённые устройства
+            models.Index(fields=['updated_at']),
+        ]
+
 
-class Event(BaseModel):
+class Event(TrackedFieldsMixin, BaseModel):
     """Модель мероприятий."""
 
+    # Поля, изменения которых пишутся в EventHistory (см. core/signals.py)
+    tracked_fields = ("amount", "amount_money", "computer_numbers", "comment", "client_id")
+
     client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="events", db_index=True)
     amount = models.PositiveIntegerField(default=0, db_index=True)
     amount_money = models.BooleanField(default=False)
@@ -154,32 +257,52 @@ class Event(BaseModel):
         indexes = [
             models.Index(fields=['client', 'created_at']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at']),
             models.Index(fields=['amount']),
         ]
+        constraints = [
+            # Неотрицательность обоих полей уже гарантирует PositiveIntegerField
+            models.CheckConstraint(check=Q(advance__lte=F('amount')), name='core_event_advance_lte_amount'),
+        ]
 
     def update_advance(self, amount, change_type, advance_money=None):
-        """Метод обновления аванса с сохранением истории."""
-        if change_type == 'add':
-            self.advance += amount
-        elif change_type == 'subtract':
-            self.advance -= amount
-
-        # Обновляем валюту аванса, если указана
-        if advance_money is not None:
-            self.advance_money = advance_money
-
-        # Валидация
-        if self.advance < 0:
-            raise ValidationError("Аванс не может быть отрицательным.")
-        if self.advance > self.amount:
-            raise ValidationError("Аванс не может быть больше общей суммы.")
-
-        # Сохранение
-        self.save()
-
-        # Запись истории
-        AdvanceHistory.objects.create(event=self, amount=amount, change_type=change_type)
-
+        """
+        Метод обновления аванса с сохранением истории.
+
+        Аванс меняется одним условным UPDATE ... SET advance = advance + delta
+        WHERE advance + delta BETWEEN 0 AND amount RETURNING ...: база сама
+        проверяет границы по актуальному значению, поэтому два одновременных
+        платежа не затирают друг друга и не нужен select_for_update. История
+        пишется в той же транзакции.
+        """
+        amount = int(amount)
+        delta = amount if change_type == 'add' else -amount
+        table = connection.ops.quote_name(self._meta.db_table)
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET advance = advance + %s, advance_money = COALESCE(%s, advance_money),"
+                    f" updated_at = %s WHERE id = %s AND advance + %s BETWEEN 0 AND amount"
+                    f" RETURNING advance, advance_money, amount, updated_at",
+                    [delta, advance_money, timezone.now(), self.pk, delta],
+                )
+                row = cursor.fetchone()
+
+            if row is None:
+                # Условие не выполнилось - выясняем, какая граница нарушена
+                current = Event.objects.filter(pk=self.pk).values('advance', 'amount').first()
+                if current is None:
+                    raise Event.DoesNotExist("Мероприятие не найдено.")
+                if current['advance'] + delta < 0:
+                    raise ValidationError("Аванс не может быть отрицательным.")
+                raise ValidationError("Аванс не может быть больше общей суммы.")
+
+            self.advance, self.advance_money, self.amount, self.updated_at = row
+            self.advance_money = bool(self.advance_money)
+
+            # Запись истории
+            AdvanceHistory.objects.create(event=self, amount=amount, change_type=change_type)
 
     def clean(self):
         """Проверка, что аванс не превышает общую сумму и что сумма не отрицательна."""
@@ -207,6 +330,7 @@ class AdvanceHistory(BaseModel):
         indexes = [
             models.Index(fields=['event', '-date']),
             models.Index(fields=['-date']),
+            models.Index(fields=['updated_at']),
         ]
         ordering = ['-date']
 
@@ -215,6 +339,20 @@ class AdvanceHistory(BaseModel):
 
 
 
+class EventTombstone(models.Model):
+    """Отметка об удалённом мероприятии - для дельта-синхронизации (/events/?updated_since=)."""
+
+    # Не ForeignKey: само мероприятие к этому моменту уже удалено
+    event_id = models.BigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-deleted_at']
+
+    def __str__(self):
+        return f"Мероприятие #{self.event_id} удалено {self.deleted_at}"
+
+
 class EventHistory(BaseModel):
     """История изменений полей договора (мероприятия)."""
 
@@ -248,9 +386,11 @@ class EventLog(BaseModel):
         return f"Лог для {self.event}: {self.message}"
 
 
-class TelegramContractLog(BaseModel):
+class TelegramContractLog(PhoneDigitsMixin, BaseModel):
     """История отправки договоров в Telegram."""
 
+    phone_source_field = "phone"
+
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="telegram_contract_logs", db_index=True)
     phone = models.CharField(max_length=15, db_index=True)
     status = models.CharField(
@@ -275,9 +415,11 @@ class TelegramContractLog(BaseModel):
         return f"Договор для {self.event} на {self.phone} - {self.get_status_display()}"
 
 
-class TelegramAdvanceNotificationLog(BaseModel):
+class TelegramAdvanceNotificationLog(PhoneDigitsMixin, BaseModel):
     """История отправки уведомлений об авансе в Telegram."""
 
+    phone_source_field = "phone"
+
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="telegram_advance_notification_logs", db_index=True)
     phone = models.CharField(max_length=15, db_index=True)
     status = models.CharField(
@@ -322,8 +464,10 @@ class WorkerNotificationSettings(BaseModel):
         return f"Уведомления работникам: {self.notification_time.strftime('%H:%M')} ({status})"
 
 
-class WorkerNotificationLog(BaseModel):
+class WorkerNotificationLog(PhoneDigitsMixin, BaseModel):
     """История отправки уведомлений работникам о мероприятиях."""
+
+    phone_source_field = "phone"
     
     worker = models.ForeignKey(
         Workers, 
@@ -387,4 +531,44 @@ class WorkerNotificationLog(BaseModel):
         verbose_name_plural = "Логи уведомлений работникам"
     
     def __str__(self):
-        return f"Уведомление для {self.worker.name} ({self.event_date}) - {self.get_status_display()}"
\ No newline at end of file
+        return f"Уведомление для {self.worker.name} ({self.event_date}) - {self.get_status_display()}"
+
+
+class ArchivedRecord(models.Model):
+    """
+    Строка истории или лога, перенесённая из основной таблицы по сроку хранения
+    (см. core/archive.py). Одна компактная таблица на все архивируемые модели:
+    поля исходной строки лежат в data, индексы - только для чтения по владельцу.
+    """
+
+    # Имя исходной модели: "EventHistory", "TelegramContractLog" и т.д.
+    source = models.CharField(max_length=50)
+    original_id = models.BigIntegerField()
+    # id мероприятия, клиента или работника, к которому относилась строка
+    owner_id = models.BigIntegerField()
+    recorded_at = models.DateTimeField()
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['source', 'owner_id', '-recorded_at']),
+            models.Index(fields=['source', '-recorded_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.source} #{self.original_id} ({self.recorded_at})"
+
+
+class JobProgress(models.Model):
+    """
+    Место, с которого продолжит прерванная долгая задача (например, core.dedup).
+    Хранится в БД, а не в кэше: кэш может вытеснить ключ или оказаться своим у
+    каждого процесса, и "продолжение" тогда молча начнётся сначала.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    position = models.CharField(max_length=255, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.position}"
@@ -0,0 +1,153 @@
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator as DjangoPaginator
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+# Ниже этого порога считаем точно (COUNT(*) дешёвый), выше - верим оценке планировщика
+ESTIMATED_COUNT_THRESHOLD = 10000
+# Сколько секунд держим точный COUNT(*) для одного и того же запроса
+EXACT_COUNT_CACHE_TIMEOUT = 30
+
+
+def wants_cursor_pagination(request):
+    """Курсорный режим включается явно: ?pagination=cursor или уже полученным ?cursor=."""
+    return request.query_params.get("pagination") == "cursor" or "cursor" in request.query_params
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset-пагинация по (-created_at, id) для больших списков.
+
+    В отличие от PageNumberPagination не делает COUNT(*) и не использует OFFSET:
+    каждая страница - это WHERE created_at < <курсор> ORDER BY created_at DESC LIMIT N
+    по индексу created_at, поэтому глубокие страницы стоят столько же, сколько первая.
+    Курсор непрозрачный (base64), клиент просто ходит по ссылкам next/previous.
+    """
+
+    ordering = ("-created_at", "id")
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+def _planner_estimate(queryset):
+    """
+    Оценка числа строк от PostgreSQL без выполнения запроса: для таблицы без
+    фильтров - pg_class.reltuples, иначе "Plan Rows" из EXPLAIN. None, если
+    оценку получить нельзя (не PostgreSQL, таблица ещё не анализировалась и т.п.).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                estimate = row[0] if row else None
+            else:
+                sql, params = queryset.order_by().query.sql_with_params()
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+                estimate = plan[0]["Plan"]["Plan Rows"]
+    except DatabaseError:
+        logger.warning("Не удалось получить оценку числа строк от планировщика", exc_info=True)
+        return None
+
+    # reltuples = -1 у таблиц, по которым ещё не было ANALYZE
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def _cached_exact_count(queryset):
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = "exact_count:" + hashlib.md5(f"{sql}|{params!r}".encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, EXACT_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class EstimatedPage(Page):
+    """Страница при оценочном count: есть ли следующая, знаем по лишней выбранной строке."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """Django Paginator, который для больших выборок берёт count у планировщика вместо COUNT(*)."""
+
+    count_is_exact = True
+
+    @cached_property
+    def count(self):
+        # Не QuerySet (например, строки вместе с архивом, core/archive.py) - считает сам объект
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        estimate = _planner_estimate(self.object_list)
+        if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+            self.count_is_exact = False
+            return estimate
+        return _cached_exact_count(self.object_list)
+
+    def page(self, number):
+        # Сначала считаем count - от него зависит, точный он или оценочный
+        self.count
+        if self.count_is_exact:
+            return super().page(number)
+
+        # С оценкой нельзя ни отсекать "лишние" страницы, ни обрезать срез по count:
+        # берём per_page + 1 строк и по лишней понимаем, есть ли следующая страница.
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("Номер страницы должен быть целым числом")
+        if number < 1:
+            raise EmptyPage("Номер страницы меньше 1")
+
+        bottom = (number - 1) * self.per_page
+        items = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not items and number > 1:
+            raise EmptyPage("На этой странице нет результатов")
+        return EstimatedPage(items[:self.per_page], number, self, has_next=len(items) > self.per_page)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    PageNumberPagination без точного COUNT(*) на больших таблицах.
+
+    Для выборки без фильтров или с оценкой выше ESTIMATED_COUNT_THRESHOLD count
+    берётся из статистики PostgreSQL, иначе - точный COUNT(*), закэшированный на
+    EXACT_COUNT_CACHE_TIMEOUT секунд. В ответе count_is_exact показывает, какой
+    count отдан.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.page.paginator.count,
+            "count_is_exact": self.page.paginator.count_is_exact,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
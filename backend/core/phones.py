@@ -0,0 +1,57 @@
+import re
+
+from django.db import transaction
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone_digits(phone):
+    """
+    Номер телефона в виде цифр E.164 без "+": "+998 (90) 123-45-67" -> "998901234567".
+
+    Правила те же, что у TelegramService.normalize_phone: 9-значный местный
+    номер дополняется кодом страны 998. Пустой номер -> "".
+    """
+    if not phone:
+        return ""
+    digits = _NON_DIGITS.sub("", str(phone))
+    if len(digits) == 9:
+        digits = "998" + digits
+    return digits
+
+
+def backfill_phone_digits(model, source_field, batch_size=1000, stdout=None):
+    """
+    Пачками заполняет phone_digits у уже существующих строк model.
+
+    Идём по первичному ключу (WHERE id > последний ORDER BY id LIMIT batch_size),
+    каждая пачка - отдельная транзакция с одним bulk_update, поэтому таблица
+    не блокируется надолго и прерванный backfill можно просто запустить снова.
+    Работает и с историческими моделями из миграций.
+    """
+    last_pk = 0
+    updated = 0
+    while True:
+        batch = list(
+            model.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .only("pk", source_field, "phone_digits")[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        changed = []
+        for obj in batch:
+            digits = normalize_phone_digits(getattr(obj, source_field))
+            if obj.phone_digits != digits:
+                obj.phone_digits = digits
+                changed.append(obj)
+        if changed:
+            with transaction.atomic():
+                model.objects.bulk_update(changed, ["phone_digits"])
+            updated += len(changed)
+
+    if stdout is not None:
+        stdout.write(f"{model._meta.label}: обновлено {updated}")
+    return updated
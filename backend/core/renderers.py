@@ -0,0 +1,71 @@
+import datetime
+import decimal
+import uuid
+
+import orjson
+from django.db.models.query import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+def _format(value, output_format):
+    if output_format is None or output_format.lower() == "iso-8601":
+        return value.isoformat()
+    return value.strftime(output_format)
+
+
+def orjson_default(obj):
+    """
+    То, что orjson не умеет сам или умеет не в формате проекта.
+
+    datetime/date приходят сюда (OPT_PASSTHROUGH_DATETIME) и форматируются так же,
+    как в сериализаторах - DATETIME_FORMAT/DATE_FORMAT из REST_FRAMEWORK
+    ("%Y-%m-%d %H:%M:%S" без смещения), а не в RFC 3339 по умолчанию orjson.
+    """
+    if isinstance(obj, datetime.datetime):
+        return _format(obj, api_settings.DATETIME_FORMAT)
+    if isinstance(obj, datetime.date):
+        return _format(obj, api_settings.DATE_FORMAT)
+    if isinstance(obj, datetime.time):
+        return _format(obj, api_settings.TIME_FORMAT)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, QuerySet):
+        return tuple(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "__iter__"):
+        return tuple(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON-рендерер на orjson вместо стандартного json.dumps.
+
+    ReturnList/ReturnDict DRF - подклассы list/dict, orjson кодирует их напрямую;
+    UUID (contract_token) тоже. Вывод компактный и в UTF-8, как у JSONRenderer
+    с настройками по умолчанию.
+    """
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = self.options
+        renderer_context = renderer_context or {}
+        # orjson поддерживает только отступ в 2 пробела - для ?indent / Accept: ...; indent=N
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=orjson_default, option=options)
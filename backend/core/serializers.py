@@ -6,6 +6,46 @@ from .models import (
 )
 
 
+class SparseFieldsMixin:
+    """
+    Разреженные наборы полей для списков (?fields=... / ?expand=...).
+
+    fields - какие поля верхнего уровня оставить; expand - какие вложенные
+    связи из expandable_fields включить. Если не передано ни то ни другое,
+    сериализатор работает как обычно (все поля). Вложенные связи без expand
+    попадают в ответ, только если явно перечислены в fields.
+    """
+
+    expandable_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        expand = kwargs.pop("expand", None)
+        super().__init__(*args, **kwargs)
+
+        if fields is None and expand is None:
+            return
+        keep = self.selected_fields(set(self.fields), fields, expand)
+        for name in set(self.fields) - keep:
+            self.fields.pop(name)
+
+    @classmethod
+    def selected_fields(cls, all_fields, fields=None, expand=None):
+        keep = set(all_fields) if fields is None else set(fields) & set(all_fields)
+        if expand is not None:
+            expandable = set(cls.expandable_fields)
+            keep = (keep - expandable) | (expandable & set(expand))
+        return keep
+
+    @classmethod
+    def selected_expandable(cls, fields=None, expand=None):
+        """Какие вложенные связи попадут в ответ - по ним вьюха решает, что prefetch-ить."""
+        expandable = set(cls.expandable_fields)
+        if fields is None and expand is None:
+            return expandable
+        return cls.selected_fields(expandable, fields, expand)
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -31,9 +71,11 @@ class PhoneClientSerializer(serializers.ModelSerializer):
         fields = ["id", "phone_number"]
 
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     phones = PhoneClientSerializer(many=True, required=False)
 
+    expandable_fields = ("phones",)
+
     class Meta:
         model = Client
         fields = ["id", "name", "is_vip", "is_archived", "phones"]
@@ -44,7 +86,7 @@ class ClientSerializer(serializers.ModelSerializer):
         # Оптимизация: bulk_create вместо цикла
         if phones_data:
             PhoneClient.objects.bulk_create([
-                PhoneClient(client=client, **phone) for phone in phones_data
+                PhoneClient(client=client, **phone).fill_phone_digits() for phone in phones_data
             ])
         return client
 
@@ -55,23 +97,84 @@ class ClientSerializer(serializers.ModelSerializer):
         instance.is_archived = validated_data.get("is_archived", instance.is_archived)
         instance.save()
 
-        # Удаляем телефоны, которых нет в обновленных данных
-        existing_phone_ids = {phone.id for phone in instance.phones.all()}
-        updated_phone_ids = {phone["id"] for phone in phones_data if "id" in phone}
-        phones_to_delete = instance.phones.exclude(id__in=updated_phone_ids)
-        phones_to_delete.delete()
+        self.sync_phones(instance, phones_data)
+        return instance
 
-        # Обновляем или добавляем новые телефоны
+    def sync_phones(self, client, phones_data):
+        """
+        Приводит телефоны клиента к phones_data за постоянное число запросов:
+        один SELECT существующих, один bulk_update изменённых, один bulk_create
+        новых, один DELETE лишних. Сигналы PhoneClient на это время отключены -
+        историю пишем здесь же одной пачкой (через буфер истории, core/history.py),
+        а кэш мероприятий клиента уже сбросило сохранение самого клиента.
+        """
+        from django.utils import timezone
+        from .history import record_history
+        from .middleware import get_current_user
+        from .signals import mute_phone_signals
+
+        existing = {phone.id: phone for phone in PhoneClient.objects.filter(client=client)}
+        updated_phone_ids = {phone["id"] for phone in phones_data if phone.get("id") in existing}
+        phones_to_delete = [phone for phone_id, phone in existing.items() if phone_id not in updated_phone_ids]
+
+        user = get_current_user()
+        history = [
+            ClientHistory(
+                client=client, field_name="phone_number",
+                old_value=phone.phone_number, new_value=None, changed_by=user,
+            )
+            for phone in phones_to_delete
+        ]
+        phones_to_update = []
+        phones_to_create = []
+        now = timezone.now()
         for phone_data in phones_data:
-            phone_id = phone_data.get("id")
-            if phone_id and phone_id in existing_phone_ids:
-                phone = PhoneClient.objects.get(id=phone_id)
+            phone = existing.get(phone_data.get("id"))
+            if phone is None:
+                phone_data = {key: value for key, value in phone_data.items() if key != "id"}
+                phones_to_create.append(PhoneClient(client=client, **phone_data).fill_phone_digits())
+                history.append(ClientHistory(
+                    client=client, field_name="phone_number",
+                    old_value=None, new_value=phone_data["phone_number"], changed_by=user,
+                ))
+            elif phone.phone_number != phone_data["phone_number"]:
+                history.append(ClientHistory(
+                    client=client, field_name="phone_number",
+                    old_value=phone.phone_number, new_value=phone_data["phone_number"], changed_by=user,
+                ))
                 phone.phone_number = phone_data["phone_number"]
-                phone.save()
-            else:
-                PhoneClient.objects.create(client=instance, **phone_data)
+                phone.updated_at = now
+                phones_to_update.append(phone.fill_phone_digits())
 
-        return instance
+        with mute_phone_signals():
+            if phones_to_delete:
+                PhoneClient.objects.filter(id__in=[phone.id for phone in phones_to_delete]).delete()
+            if phones_to_update:
+                PhoneClient.objects.bulk_update(phones_to_update, ["phone_number", "phone_digits", "updated_at"])
+            if phones_to_create:
+                PhoneClient.objects.bulk_create(phones_to_create)
+        record_history(history)
+
+
+class ClientStatsSerializer(ClientSerializer):
+    """
+    Клиент вместе с агрегатами по его мероприятиям (только чтение). Значения
+    берутся из аннотаций queryset (см. annotate_client_stats во views), суммы
+    разнесены по валютам: *_uzs - сумы, *_usd - доллары.
+    """
+
+    events_count = serializers.IntegerField(read_only=True)
+    amount_uzs = serializers.IntegerField(read_only=True)
+    amount_usd = serializers.IntegerField(read_only=True)
+    advance_uzs = serializers.IntegerField(read_only=True)
+    advance_usd = serializers.IntegerField(read_only=True)
+    balance_uzs = serializers.IntegerField(read_only=True)
+    balance_usd = serializers.IntegerField(read_only=True)
+
+    class Meta(ClientSerializer.Meta):
+        fields = ClientSerializer.Meta.fields + [
+            "events_count", "amount_uzs", "amount_usd", "advance_uzs", "advance_usd", "balance_uzs", "balance_usd",
+        ]
 
 
 class WorkersSerializer(serializers.ModelSerializer):
@@ -102,12 +205,51 @@ class WorkersSerializer(serializers.ModelSerializer):
         return instance
 
 
+def _valid_pks(values):
+    """Значения, похожие на первичный ключ; остальное отсеет сама валидация поля."""
+    pks = set()
+    for value in values:
+        if isinstance(value, bool):
+            continue
+        try:
+            pks.add(int(value))
+        except (TypeError, ValueError):
+            continue
+    return pks
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField, который сначала ищет объект среди заранее загруженных
+    в context["prefetched"][Model] (см. EventSerializer.to_internal_value) и лишь
+    без них делает обычный запрос на каждый id.
+    """
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get("prefetched", {}).get(self.get_queryset().model)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return prefetched[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
 class DeviceSerializer(serializers.ModelSerializer):
-    workers = serializers.PrimaryKeyRelatedField(many=True, queryset=Workers.objects.all())
+    # Как и у PhoneClientSerializer: без явного поля id DRF отбрасывает его при
+    # валидации, и EventSerializer.update() пересоздавал бы каждое устройство.
+    id = serializers.IntegerField(required=False)
+    service = PrefetchedPrimaryKeyRelatedField(queryset=Service.objects.all())
+    workers = PrefetchedPrimaryKeyRelatedField(many=True, queryset=Workers.objects.all())
     # event_service_date = serializers.DateField(format="%Y-%m-%d", allow_null=True)
 
     def create(self, validated_data):
         workers = validated_data.pop("workers", None)  # Извлекаем workers, если они есть
+        validated_data.pop("id", None)
         device = Device.objects.create(**validated_data)
         if workers:
             device.workers.set(workers)  # Привязываем работников к устройству
@@ -196,11 +338,53 @@ class ClientHistorySerializer(serializers.ModelSerializer):
         return "client"
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     client = ClientSerializer()
     devices = DeviceSerializer(many=True)
     advance_history = AdvanceHistorySerializer(many=True, read_only=True)  # История аванса
 
+    expandable_fields = ("client", "devices", "advance_history")
+
+    @staticmethod
+    def prefetch_device_relations(payloads):
+        """
+        Услуги и работники, на которые ссылаются устройства из payloads, - по одному
+        запросу на таблицу. Результат кладётся в context["prefetched"].
+        """
+        service_ids, worker_ids = [], []
+        for data in payloads:
+            devices = data.get("devices") if isinstance(data, dict) else None
+            if not isinstance(devices, list):
+                continue
+            for device in devices:
+                if not isinstance(device, dict):
+                    continue
+                service_ids.append(device.get("service"))
+                workers = device.get("workers")
+                if isinstance(workers, list):
+                    worker_ids.extend(workers)
+        return {
+            Service: Service.objects.in_bulk(_valid_pks(service_ids)),
+            Workers: Workers.objects.in_bulk(_valid_pks(worker_ids)),
+        }
+
+    def to_internal_value(self, data):
+        # Услуги и работников всех устройств загружаем заранее - по одному запросу
+        # на таблицу вместо запроса на каждый id при валидации каждого устройства.
+        # Пакетная вьюха (/events/batch/) загружает их сразу для всех операций и передаёт в context.
+        devices = data.get("devices") if isinstance(data, dict) else None
+        if isinstance(devices, list) and "prefetched" not in self._context:
+            self._context["prefetched"] = self.prefetch_device_relations([data])
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        # То же ограничение есть в БД (core_event_advance_lte_amount) - здесь, чтобы вернуть 400, а не 500
+        amount = attrs.get("amount", getattr(self.instance, "amount", 0))
+        advance = attrs.get("advance", getattr(self.instance, "advance", 0))
+        if advance > amount:
+            raise serializers.ValidationError({"advance": "Аванс не может быть больше общей суммы."})
+        return attrs
+
     def create(self, validated_data):
         devices_data = validated_data.pop("devices", [])
         client_data = validated_data.pop("client")
@@ -211,7 +395,7 @@ class EventSerializer(serializers.ModelSerializer):
         # Оптимизация: bulk_create для телефонов
         if phones:
             PhoneClient.objects.bulk_create([
-                PhoneClient(client=client, **phone) for phone in phones
+                PhoneClient(client=client, **phone).fill_phone_digits() for phone in phones
             ])
         validated_data["client"] = client
 
@@ -224,17 +408,21 @@ class EventSerializer(serializers.ModelSerializer):
         
         for device_data in devices_data:
             workers = device_data.pop("workers", [])
+            device_data.pop("id", None)
             device = Device(event=event, **device_data)
             devices.append(device)
             workers_data.append(workers)
         
         # Создаём все устройства одним запросом
         Device.objects.bulk_create(devices)
-        
-        # Устанавливаем workers после создания (нужно получить ID)
-        for device, workers in zip(devices, workers_data):
-            if workers:
-                device.workers.set(workers)
+
+        # Связи устройство-работник всех устройств - тоже одним запросом (нужны ID устройств)
+        Through = Device.workers.through
+        Through.objects.bulk_create([
+            Through(device_id=device.pk, workers_id=worker.pk)
+            for device, workers in zip(devices, workers_data)
+            for worker in dict.fromkeys(workers)
+        ])
 
         return event
 
@@ -250,34 +438,7 @@ class EventSerializer(serializers.ModelSerializer):
 
         # Обновление устройств
         if devices_data is not None:
-            existing_devices = {device.id: device for device in instance.devices.all()}
-
-            updated_device_ids = set()
-
-            for device_data in devices_data:
-                workers = device_data.pop("workers", [])
-                device_id = device_data.get("id")
-
-                if device_id and device_id in existing_devices:
-                    # Обновляем существующее устройство
-                    device = existing_devices[device_id]
-                    for attr, value in device_data.items():
-                        setattr(device, attr, value)
-                    device.save()
-                    if workers:
-                        device.workers.set(workers)
-                    updated_device_ids.add(device_id)
-                else:
-                    # Создаем новое устройство
-                    device = Device.objects.create(event=instance, **device_data)
-                    if workers:
-                        device.workers.set(workers)
-                    updated_device_ids.add(device.id)
-
-            # Удаляем устройства, которые не были включены в devices_data
-            for device_id, device in existing_devices.items():
-                if device_id not in updated_device_ids:
-                    device.delete()
+            self.sync_devices(instance, devices_data)
 
         # Обновляем остальные поля события
         for attr, value in validated_data.items():
@@ -285,6 +446,84 @@ class EventSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+    DEVICE_UPDATE_FIELDS = ("service", "camera_count", "comment", "restaurant_name", "event_service_date")
+
+    def sync_devices(self, event, devices_data):
+        """
+        Приводит устройства мероприятия к devices_data за постоянное число запросов:
+        по одному SELECT устройств и связей с работниками, один bulk_update
+        изменённых, один bulk_create новых, один DELETE лишних устройств и по
+        одному INSERT/DELETE в таблице связей устройство-работник.
+        """
+        from django.utils import timezone
+
+        Through = Device.workers.through
+        existing = {device.id: device for device in Device.objects.filter(event=event)}
+        current_links = {}
+        for link_id, device_id, worker_id in Through.objects.filter(device__event=event).values_list(
+            "id", "device_id", "workers_id"
+        ):
+            current_links[(device_id, worker_id)] = link_id
+
+        now = timezone.now()
+        devices_to_update = []
+        devices_to_create = []
+        new_device_workers = []
+        wanted_links = set()
+        kept_device_ids = set()
+        for device_data in devices_data:
+            device_data = dict(device_data)
+            workers = device_data.pop("workers", [])
+            worker_ids = {worker.pk for worker in workers}
+            device = existing.get(device_data.pop("id", None))
+
+            if device is None:
+                devices_to_create.append(Device(event=event, **device_data))
+                new_device_workers.append(worker_ids)
+                continue
+
+            kept_device_ids.add(device.id)
+            changed = False
+            for attr, value in device_data.items():
+                if attr == "service":
+                    # Сравниваем по id, чтобы не загружать услугу каждого устройства
+                    attr, value = "service_id", value.pk
+                if getattr(device, attr) != value:
+                    setattr(device, attr, value)
+                    changed = True
+            # Как и раньше, пустой список работников не трогает текущие связи
+            old_worker_ids = {worker_id for device_id, worker_id in current_links if device_id == device.id}
+            if workers and worker_ids != old_worker_ids:
+                changed = True
+            wanted_links.update((device.id, worker_id) for worker_id in (worker_ids if workers else old_worker_ids))
+            if changed:
+                device.updated_at = now
+                devices_to_update.append(device)
+
+        if devices_to_update:
+            Device.objects.bulk_update(devices_to_update, [*self.DEVICE_UPDATE_FIELDS, "updated_at"])
+        if devices_to_create:
+            Device.objects.bulk_create(devices_to_create)
+            for device, worker_ids in zip(devices_to_create, new_device_workers):
+                wanted_links.update((device.id, worker_id) for worker_id in worker_ids)
+
+        removed_device_ids = set(existing) - kept_device_ids
+        if removed_device_ids:
+            # Связи удалённых устройств уйдут вместе с ними (каскад)
+            Device.objects.filter(pk__in=removed_device_ids).delete()
+
+        stale_link_ids = [
+            link_id for key, link_id in current_links.items()
+            if key not in wanted_links and key[0] not in removed_device_ids
+        ]
+        if stale_link_ids:
+            Through.objects.filter(pk__in=stale_link_ids).delete()
+        new_links = wanted_links - set(current_links)
+        if new_links:
+            Through.objects.bulk_create([
+                Through(device_id=device_id, workers_id=worker_id) for device_id, worker_id in new_links
+            ])
+
     class Meta:
         model = Event
         fields = [
@@ -304,6 +543,178 @@ class EventSerializer(serializers.ModelSerializer):
         ]
 
 
+class ImportDeviceSerializer(serializers.Serializer):
+    """Устройство в строке импорта (см. core/importer.py). Услуга и работники проверяются по context без запросов."""
+
+    service = serializers.IntegerField()
+    workers = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    camera_count = serializers.IntegerField(min_value=0, default=0)
+    restaurant_name = serializers.CharField(max_length=255, required=False, allow_null=True, allow_blank=True)
+    comment = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    event_service_date = serializers.DateField(required=False, allow_null=True)
+
+    def validate_service(self, value):
+        if value not in self.context["service_ids"]:
+            raise serializers.ValidationError(f"Услуга {value} не найдена.")
+        return value
+
+    def validate_workers(self, value):
+        unknown = [worker_id for worker_id in value if worker_id not in self.context["worker_ids"]]
+        if unknown:
+            raise serializers.ValidationError(f"Работники не найдены: {', '.join(map(str, unknown))}.")
+        return list(dict.fromkeys(value))
+
+
+class ImportClientSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255, required=False, allow_null=True, allow_blank=True)
+    is_vip = serializers.BooleanField(default=False)
+    phones = PhoneClientSerializer(many=True, required=False, default=list)
+
+
+class ImportEventSerializer(serializers.Serializer):
+    """
+    Строка импорта мероприятий - та же структура, что у POST /events/, но без
+    запросов к БД при валидации: допустимые id услуг и работников передаются
+    в context ("service_ids", "worker_ids"), чтобы проверять тысячи строк за раз.
+    """
+
+    client = ImportClientSerializer()
+    devices = ImportDeviceSerializer(many=True, required=False, default=list)
+    computer_numbers = serializers.IntegerField(min_value=0, default=0)
+    amount = serializers.IntegerField(min_value=0, default=0)
+    amount_money = serializers.BooleanField(default=False)
+    advance = serializers.IntegerField(min_value=0, default=0)
+    advance_money = serializers.BooleanField(default=False)
+    comment = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+
+    def validate(self, attrs):
+        if attrs["advance"] > attrs["amount"]:
+            raise serializers.ValidationError("Аванс не может быть больше общей суммы.")
+        return attrs
+
+
+class EventFastReadSerializer:
+    """
+    Быстрый read-only путь для списков мероприятий.
+
+    Отдаёт ровно ту же структуру JSON, что и EventSerializer, но собирает её
+    из values()-строк и обычных словарей: по одному запросу на клиентов,
+    телефоны, устройства, работников устройств и историю аванса для всей
+    пачки мероприятий, без DRF-полей на каждую строку. На вход - строки
+    events.values(*EventFastReadSerializer.event_values) (или их список).
+    Интерфейс как у сериализатора: EventFastReadSerializer(rows, many=True).data.
+    """
+
+    event_values = (
+        "id", "client_id", "computer_numbers", "amount", "amount_money", "advance", "advance_money",
+        "comment", "created_at", "updated_at", "contract_token",
+    )
+
+    _datetime_field = serializers.DateTimeField()
+    _date_field = serializers.DateField()
+
+    def __init__(self, instance, many=True, fields=None, expand=None):
+        self.rows = list(instance)
+        keep = EventSerializer.selected_fields(EventSerializer.Meta.fields, fields, expand)
+        self.field_names = [name for name in EventSerializer.Meta.fields if name in keep]
+
+    @property
+    def data(self):
+        if not self.rows:
+            return []
+
+        event_ids = [row["id"] for row in self.rows]
+        clients = self._clients({row["client_id"] for row in self.rows}) if "client" in self.field_names else {}
+        devices = self._devices(event_ids) if "devices" in self.field_names else {}
+        advance_history = self._advance_history(event_ids) if "advance_history" in self.field_names else {}
+
+        to_datetime = self._datetime_field.to_representation
+        result = []
+        for row in self.rows:
+            values = {
+                "id": row["id"],
+                "client": clients.get(row["client_id"]),
+                "devices": devices.get(row["id"], []),
+                "computer_numbers": row["computer_numbers"],
+                "amount": row["amount"],
+                "amount_money": row["amount_money"],
+                "advance": row["advance"],
+                "advance_money": row["advance_money"],
+                "comment": row["comment"],
+                "created_at": to_datetime(row["created_at"]) if row["created_at"] is not None else None,
+                "updated_at": to_datetime(row["updated_at"]) if row["updated_at"] is not None else None,
+                "advance_history": advance_history.get(row["id"], []),
+                "contract_token": str(row["contract_token"]) if row["contract_token"] is not None else None,
+            }
+            result.append({name: values[name] for name in self.field_names})
+        return result
+
+    def _clients(self, client_ids):
+        phones = {}
+        # Порядок как у PhoneClient.Meta.ordering - тот же, что даёт prefetch_related
+        for client_id, phone_id, phone_number in PhoneClient.objects.filter(
+            client_id__in=client_ids
+        ).values_list("client_id", "id", "phone_number"):
+            phones.setdefault(client_id, []).append({"id": phone_id, "phone_number": phone_number})
+
+        return {
+            client_id: {
+                "id": client_id,
+                "name": name,
+                "is_vip": is_vip,
+                "is_archived": is_archived,
+                "phones": phones.get(client_id, []),
+            }
+            for client_id, name, is_vip, is_archived in Client.objects.filter(
+                pk__in=client_ids
+            ).values_list("id", "name", "is_vip", "is_archived")
+        }
+
+    def _devices(self, event_ids):
+        # Порядок по id - тот же, что у prefetch устройств в EventAPIView.get_event_queryset
+        rows = list(
+            Device.objects.filter(event_id__in=event_ids).order_by("id").values_list(
+                "event_id", "id", "service_id", "camera_count", "comment", "restaurant_name", "event_service_date"
+            )
+        )
+
+        workers = {}
+        # Сортировка как у Workers.Meta.ordering - в том же порядке их отдаёт PrimaryKeyRelatedField
+        for device_id, worker_id in Device.workers.through.objects.filter(
+            device_id__in=[row[1] for row in rows]
+        ).order_by("workers__order").values_list("device_id", "workers_id"):
+            workers.setdefault(device_id, []).append(worker_id)
+
+        to_date = self._date_field.to_representation
+        devices = {}
+        for event_id, device_id, service_id, camera_count, comment, restaurant_name, service_date in rows:
+            devices.setdefault(event_id, []).append({
+                "id": device_id,
+                "service": service_id,
+                "camera_count": camera_count,
+                "comment": comment,
+                "workers": workers.get(device_id, []),
+                "restaurant_name": restaurant_name,
+                "event_service_date": to_date(service_date) if service_date is not None else None,
+            })
+        return devices
+
+    def _advance_history(self, event_ids):
+        to_datetime = self._datetime_field.to_representation
+        history = {}
+        # Порядок как у AdvanceHistory.Meta.ordering (-date)
+        for event_id, history_id, amount, change_type, changed_at in AdvanceHistory.objects.filter(
+            event_id__in=event_ids
+        ).values_list("event_id", "id", "amount", "change_type", "date"):
+            history.setdefault(event_id, []).append({
+                "id": history_id,
+                "amount": amount,
+                "change_type": change_type,
+                "date": to_datetime(changed_at) if changed_at is not None else None,
+            })
+        return history
+
+
 class PublicContractDeviceSerializer(serializers.ModelSerializer):
     """Компактное представление устройства для публичной (без авторизации) страницы договора."""
     service_name = serializers.CharField(source="service.name", default="", read_only=True)
@@ -1,13 +1,16 @@
 import threading
+from contextlib import contextmanager
 
-from django.db.models.signals import pre_save, pre_delete, post_save, post_delete
+from django.db.models.signals import pre_save, pre_delete, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 
+from .archive import delete_archived_for
+from .event_cache import invalidate_event_payloads, touch_devices
+from .history import record_history
 from .middleware import get_current_user
-from .models import Client, ClientHistory, Event, EventHistory, PhoneClient
-
-TRACKED_EVENT_FIELDS = ["amount", "amount_money", "computer_numbers", "comment"]
-TRACKED_CLIENT_FIELDS = ["name"]
+from .models import (
+    AdvanceHistory, Client, ClientHistory, Device, Event, EventHistory, EventTombstone, PhoneClient, Service, Workers,
+)
 
 # Клиенты, которые прямо сейчас удаляются в текущем потоке (см. mark_client_deleting ниже).
 # pre_delete гарантированно срабатывает раньше любых DELETE в каскаде, поэтому к моменту,
@@ -20,6 +23,26 @@ def _is_client_being_deleted(client_id):
     return bool(ids) and client_id in ids
 
 
+# Пока флаг выставлен, сигналы PhoneClient в этом потоке ничего не делают: вызывающий код
+# (ClientSerializer.update) сам пишет историю одним bulk_create, а кэш мероприятий
+# сбрасывает сохранение клиента.
+_phone_signals_muted = threading.local()
+
+
+def _are_phone_signals_muted():
+    return getattr(_phone_signals_muted, "active", False)
+
+
+@contextmanager
+def mute_phone_signals():
+    previous = _are_phone_signals_muted()
+    _phone_signals_muted.active = True
+    try:
+        yield
+    finally:
+        _phone_signals_muted.active = previous
+
+
 @receiver(pre_delete, sender=Client)
 def mark_client_deleting(sender, instance, **kwargs):
     ids = getattr(_deleting_client_ids, "ids", None)
@@ -36,26 +59,35 @@ def unmark_client_deleting(sender, instance, **kwargs):
         ids.discard(instance.pk)
 
 
+def _original_values(instance):
+    """
+    Исходные значения отслеживаемых полей: снимок, сделанный при загрузке
+    (TrackedFieldsMixin), а если экземпляр собран без загрузки из БД - один
+    SELECT только этих полей. None, если строки в БД нет.
+    """
+    original = instance.get_original_values()
+    if original is None:
+        original = type(instance)._default_manager.filter(pk=instance.pk).values(*instance.tracked_fields).first()
+    return original
+
+
 @receiver(pre_save, sender=Event)
 def stash_event_changes(sender, instance, **kwargs):
-    """Сравнивает instance со свежей копией из БД и запоминает изменения для post_save."""
+    """Сравнивает instance с исходными значениями и запоминает изменения для post_save."""
     if instance.pk is None:
         return
 
-    try:
-        old = Event.objects.get(pk=instance.pk)
-    except Event.DoesNotExist:
+    old = _original_values(instance)
+    if old is None:
         return
 
     changes = []
-    for field in TRACKED_EVENT_FIELDS:
-        old_value = getattr(old, field)
+    for field in instance.tracked_fields:
+        old_value = old[field]
         new_value = getattr(instance, field)
         if old_value != new_value:
-            changes.append(("__event__", field, old_value, new_value))
-
-    if old.client_id != instance.client_id:
-        changes.append(("__event__", "client", old.client_id, instance.client_id))
+            # client_id пишется в историю под именем поля связи - "client"
+            changes.append(("__event__", sender._meta.get_field(field).name, old_value, new_value))
 
     if changes:
         instance._pending_history = changes
@@ -68,7 +100,7 @@ def write_event_history(sender, instance, **kwargs):
         return
 
     user = get_current_user()
-    EventHistory.objects.bulk_create([
+    record_history(
         EventHistory(
             event=instance,
             field_name=field,
@@ -77,7 +109,7 @@ def write_event_history(sender, instance, **kwargs):
             changed_by=user,
         )
         for _, field, old_value, new_value in changes
-    ])
+    )
     del instance._pending_history
 
 
@@ -86,14 +118,13 @@ def stash_client_changes(sender, instance, **kwargs):
     if instance.pk is None:
         return
 
-    try:
-        old = Client.objects.get(pk=instance.pk)
-    except Client.DoesNotExist:
+    old = _original_values(instance)
+    if old is None:
         return
 
     changes = []
-    for field in TRACKED_CLIENT_FIELDS:
-        old_value = getattr(old, field)
+    for field in instance.tracked_fields:
+        old_value = old[field]
         new_value = getattr(instance, field)
         if old_value != new_value:
             changes.append((field, old_value, new_value))
@@ -109,7 +140,7 @@ def write_client_history(sender, instance, **kwargs):
         return
 
     user = get_current_user()
-    ClientHistory.objects.bulk_create([
+    record_history(
         ClientHistory(
             client=instance,
             field_name=field,
@@ -118,36 +149,37 @@ def write_client_history(sender, instance, **kwargs):
             changed_by=user,
         )
         for field, old_value, new_value in changes
-    ])
+    )
     del instance._pending_history
 
 
 @receiver(pre_save, sender=PhoneClient)
 def stash_phone_change(sender, instance, **kwargs):
-    if instance.pk is None:
+    if instance.pk is None or _are_phone_signals_muted():
         return
 
-    try:
-        old = PhoneClient.objects.get(pk=instance.pk)
-    except PhoneClient.DoesNotExist:
+    old = _original_values(instance)
+    if old is None:
         return
 
-    if old.phone_number != instance.phone_number:
-        instance._pending_phone_change = (old.phone_number, instance.phone_number)
+    if old["phone_number"] != instance.phone_number:
+        instance._pending_phone_change = (old["phone_number"], instance.phone_number)
 
 
 @receiver(post_save, sender=PhoneClient)
 def write_phone_history(sender, instance, created, **kwargs):
+    if _are_phone_signals_muted():
+        return
     user = get_current_user()
 
     if created:
-        ClientHistory.objects.create(
-            client=instance.client,
+        record_history([ClientHistory(
+            client_id=instance.client_id,
             field_name="phone_number",
             old_value=None,
             new_value=instance.phone_number,
             changed_by=user,
-        )
+        )])
         return
 
     change = getattr(instance, "_pending_phone_change", None)
@@ -155,13 +187,13 @@ def write_phone_history(sender, instance, created, **kwargs):
         return
 
     old_value, new_value = change
-    ClientHistory.objects.create(
-        client=instance.client,
+    record_history([ClientHistory(
+        client_id=instance.client_id,
         field_name="phone_number",
         old_value=old_value,
         new_value=new_value,
         changed_by=user,
-    )
+    )])
     del instance._pending_phone_change
 
 
@@ -169,15 +201,88 @@ def write_phone_history(sender, instance, created, **kwargs):
 def write_phone_deletion_history(sender, instance, **kwargs):
     # Если телефон удалился как часть каскадного удаления самого клиента,
     # клиента (и вместе с ним этой записи истории) уже не будет — не пишем.
-    if _is_client_being_deleted(instance.client_id):
+    if _are_phone_signals_muted() or _is_client_being_deleted(instance.client_id):
         return
     if not Client.objects.filter(pk=instance.client_id).exists():
         return
 
-    ClientHistory.objects.create(
-        client=instance.client,
+    record_history([ClientHistory(
+        client_id=instance.client_id,
         field_name="phone_number",
         old_value=instance.phone_number,
         new_value=None,
         changed_by=get_current_user(),
-    )
+    )])
+
+
+@receiver(post_delete, sender=Event)
+def record_event_tombstone(sender, instance, **kwargs):
+    """Запоминаем id удалённого мероприятия, чтобы дельта-синхронизация сообщила о нём клиентам."""
+    EventTombstone.objects.create(event_id=instance.pk)
+
+
+# Архив (core/archive.py) ссылается на владельца просто по id - чистим его сами
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Client)
+@receiver(post_delete, sender=Workers)
+def delete_owner_archive(sender, instance, **kwargs):
+    owner_field = {Event: "event", Client: "client", Workers: "worker"}[sender]
+    delete_archived_for(owner_field, [instance.pk])
+
+
+# --- Инвалидация кэша представлений мероприятий (core/event_cache.py) ---
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_payload(sender, instance, **kwargs):
+    invalidate_event_payloads([instance.pk])
+
+
+@receiver(post_save, sender=Device)
+@receiver(post_delete, sender=Device)
+@receiver(post_save, sender=AdvanceHistory)
+@receiver(post_delete, sender=AdvanceHistory)
+def invalidate_event_payload_by_child(sender, instance, **kwargs):
+    invalidate_event_payloads([instance.event_id])
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def invalidate_client_event_payloads(sender, instance, **kwargs):
+    invalidate_event_payloads(Event.objects.filter(client_id=instance.pk).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=PhoneClient)
+@receiver(post_delete, sender=PhoneClient)
+def invalidate_phone_event_payloads(sender, instance, **kwargs):
+    if _are_phone_signals_muted():
+        return
+    invalidate_event_payloads(Event.objects.filter(client_id=instance.client_id).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_service_event_payloads(sender, instance, **kwargs):
+    invalidate_event_payloads(Device.objects.filter(service_id=instance.pk).values_list("event_id", flat=True))
+
+
+@receiver(pre_delete, sender=Workers)
+def invalidate_worker_event_payloads(sender, instance, **kwargs):
+    # Связи device-worker удаляются каскадом без m2m_changed, поэтому отмечаем устройства заранее
+    touch_devices(Device.objects.filter(workers=instance))
+
+
+@receiver(m2m_changed, sender=Device.workers.through)
+def invalidate_device_workers_payloads(sender, instance, action, reverse, pk_set, **kwargs):
+    # После clear уже не узнать, какие связи были, поэтому clear обрабатываем в pre_clear
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        # instance - Device; его updated_at обновляет сам sync_devices
+        invalidate_event_payloads([instance.event_id])
+    elif action == "pre_clear":
+        # instance - Workers, очищаются все его устройства
+        touch_devices(Device.objects.filter(workers=instance))
+    else:
+        touch_devices(Device.objects.filter(pk__in=pk_set))
@@ -0,0 +1,51 @@
+from django.http import StreamingHttpResponse
+
+from .renderers import ORJSONRenderer
+
+# Сколько объектов сериализуем за раз. prefetch_related выполняется на каждый чанк
+# отдельно (QuerySet.iterator(chunk_size=...)), поэтому в памяти одновременно живёт
+# не больше STREAM_CHUNK_SIZE объектов вместе с их prefetch-кэшами.
+STREAM_CHUNK_SIZE = 500
+
+
+def _iter_chunks(queryset, chunk_size):
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_json_array(queryset, serializer_class, chunk_size, serializer_kwargs):
+    renderer = ORJSONRenderer()
+    yield b"["
+    first = True
+    for chunk in _iter_chunks(queryset, chunk_size):
+        data = serializer_class(chunk, many=True, **serializer_kwargs).data
+        # Рендерим чанк как обычный JSON-массив и отрезаем внешние скобки,
+        # чтобы склеить чанки в один массив без повторного кодирования.
+        body = renderer.render(data)[1:-1]
+        if not body:
+            continue
+        if not first:
+            yield b","
+        yield body
+        first = False
+    yield b"]"
+
+
+def streaming_json_response(queryset, serializer_class, chunk_size=STREAM_CHUNK_SIZE, **serializer_kwargs):
+    """
+    Отдаёт список как JSON-массив по частям (StreamingHttpResponse).
+
+    Ответ побайтно совпадает с Response(serializer.data) для того же queryset,
+    но не собирает весь список в памяти: первые байты уходят клиенту сразу,
+    а пиковое потребление памяти воркером не зависит от количества записей.
+    """
+    return StreamingHttpResponse(
+        _iter_json_array(queryset, serializer_class, chunk_size, serializer_kwargs),
+        content_type="application/json",
+    )
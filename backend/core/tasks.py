@@ -145,6 +145,20 @@ def generate_worker_notification_message(worker, devices, event_date, date_text)
     return message
 
 
+@shared_task
+def merge_duplicate_clients_task(batch_size=500, dry_run=False):
+    """Объединяет клиентов-дубликатов по номеру телефона (см. core.dedup). Продолжает с места прошлого запуска."""
+    from .dedup import merge_duplicate_clients
+    return merge_duplicate_clients(batch_size=batch_size, dry_run=dry_run)
+
+
+@shared_task
+def archive_old_records_task(batch_size=1000):
+    """Переносит старую историю и логи в архив и чистит старые отметки об удалении (см. core.archive)."""
+    from .archive import archive_old_records
+    return archive_old_records(batch_size=batch_size)
+
+
 def send_telegram_message(phone, message):
     """Отправка сообщения через Telegram."""
     try:
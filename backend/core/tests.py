@@ -0,0 +1,264 @@
+import random
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from .models import AdvanceHistory, Client, Device, Event, PhoneClient, Service, Workers
+from .serializers import EventFastReadSerializer, EventSerializer
+from .views import EventAPIView
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# (fields, expand) - как их передают ?fields= и ?expand=
+SPARSE_VARIANTS = [
+    (None, None),
+    (["id", "amount", "comment", "created_at"], None),
+    (["id", "client"], None),
+    (None, ["devices"]),
+    (["id", "advance", "advance_money"], ["client", "advance_history"]),
+    (["id", "contract_token"], []),
+]
+
+
+def sparse_params(fields, expand):
+    params = {}
+    if fields is not None:
+        params["fields"] = ",".join(fields)
+    if expand is not None:
+        params["expand"] = ",".join(expand)
+    return params
+
+
+class EventsTestMixin:
+    """Генерирует мероприятия со всеми вложенными связями и клиента API под администратором."""
+
+    EVENTS_COUNT = 23
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(20240501)
+        cls.admin = User.objects.create(username="admin", is_staff=True, is_superuser=True)
+        cls.services = [
+            Service.objects.create(name="Фото", order=1),
+            Service.objects.create(name="Видео", is_active_camera=True, order=2),
+        ]
+        cls.workers = [
+            Workers.objects.create(name=f"Работник {i}", phone_number=f"+99891{i:07d}", order=i)
+            for i in range(6)
+        ]
+
+        start = datetime(2025, 1, 1, 10, 0)
+        device_pk = 100000
+        for i in range(cls.EVENTS_COUNT):
+            client = Client.objects.create(name=f"Клиент {i}" if i % 5 else None, is_vip=i % 4 == 0)
+            for j in range(rng.randint(0, 3)):
+                PhoneClient.objects.create(client=client, phone_number=f"+9989{i:03d}{j:05d}")
+
+            amount = rng.randint(1000, 50000)
+            event = Event.objects.create(
+                client=client,
+                amount=amount,
+                amount_money=rng.random() < 0.5,
+                advance=rng.randint(0, amount // 2),
+                advance_money=rng.random() < 0.5,
+                computer_numbers=rng.randint(0, 5),
+                comment=None if i % 3 == 0 else f"Комментарий {i}",
+            )
+            # Разные created_at - порядок списка однозначен в любой пагинации
+            Event.objects.filter(pk=event.pk).update(created_at=start + timedelta(hours=rng.randint(0, 24 * 300)))
+
+            for k in range(rng.randint(0, 4)):
+                # id по убыванию: порядок вставки не совпадает с порядком первичного ключа,
+                # так что совпадение ответов не держится на физическом порядке строк
+                device_pk -= 1
+                device = Device.objects.create(
+                    pk=device_pk,
+                    event=event,
+                    service=rng.choice(cls.services),
+                    camera_count=rng.randint(0, 8),
+                    restaurant_name=rng.choice([None, "Ресторан", "Банкетный зал"]),
+                    comment=rng.choice([None, "", f"Устройство {k}"]),
+                    event_service_date=rng.choice([None, (start + timedelta(days=rng.randint(0, 365))).date()]),
+                )
+                device.workers.set(rng.sample(cls.workers, rng.randint(0, 4)))
+
+            for k in range(rng.randint(0, 3)):
+                history = AdvanceHistory.objects.create(
+                    event=event, amount=rng.randint(1, 5000), change_type=rng.choice(["add", "subtract"])
+                )
+                AdvanceHistory.objects.filter(pk=history.pk).update(date=start + timedelta(days=i, minutes=k))
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+        self.renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+    def render(self, data):
+        return self.renderer.render(data)
+
+    def expected_events(self, fields=None, expand=None):
+        """Эталон - EventSerializer на queryset с prefetch, в порядке списков API."""
+        events = EventAPIView().get_event_queryset(fields, expand).order_by("-created_at", "id")
+        return EventSerializer(events, many=True, fields=fields, expand=expand).data
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class EventFastReadEquivalenceTests(EventsTestMixin, TestCase):
+    """Быстрый путь списков мероприятий отдаёт побайтно тот же JSON, что и EventSerializer."""
+
+    def test_fast_serializer_matches_event_serializer(self):
+        rows = Event.objects.order_by("-created_at", "id").values(*EventFastReadSerializer.event_values)
+        for fields, expand in SPARSE_VARIANTS:
+            with self.subTest(fields=fields, expand=expand):
+                fast = EventFastReadSerializer(rows, many=True, fields=fields, expand=expand).data
+                self.assertEqual(self.render(fast), self.render(self.expected_events(fields, expand)))
+
+    def test_streaming_list(self):
+        for fields, expand in SPARSE_VARIANTS:
+            with self.subTest(fields=fields, expand=expand):
+                expected = self.render(self.expected_events(fields, expand))
+                # Второй запрос отдаётся из кэша представлений
+                for _ in range(2):
+                    response = self.api.get("/api/events/", sparse_params(fields, expand))
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(b"".join(response.streaming_content), expected)
+
+    def test_page_list(self):
+        page_size = 7
+        for fields, expand in SPARSE_VARIANTS:
+            expected = list(self.expected_events(fields, expand))
+            for page in range(1, 5):
+                with self.subTest(fields=fields, expand=expand, page=page):
+                    params = {**sparse_params(fields, expand), "page": page, "page_size": page_size}
+                    for _ in range(2):
+                        response = self.api.get("/api/events/", params)
+                        self.assertEqual(response.status_code, 200)
+                        results = expected[(page - 1) * page_size:page * page_size]
+                        self.assertEqual(response.content, self.render({**response.data, "results": results}))
+
+    def test_cursor_list(self):
+        for fields, expand in SPARSE_VARIANTS:
+            with self.subTest(fields=fields, expand=expand):
+                expected = list(self.expected_events(fields, expand))
+                received = []
+                url = "/api/events/?" + urlencode({**sparse_params(fields, expand), "pagination": "cursor"})
+                while url:
+                    response = self.api.get(url)
+                    self.assertEqual(response.status_code, 200)
+                    results = expected[len(received):len(received) + len(response.data["results"])]
+                    self.assertEqual(response.content, self.render({**response.data, "results": results}))
+                    received.extend(response.data["results"])
+                    url = response.data["next"]
+                self.assertEqual(self.render(received), self.render(expected))
+
+    def test_delta_list(self):
+        updated_since = (datetime.now() - timedelta(days=1)).isoformat()
+        for fields, expand in SPARSE_VARIANTS:
+            with self.subTest(fields=fields, expand=expand):
+                params = {**sparse_params(fields, expand), "updated_since": updated_since}
+                response = self.api.get("/api/events/", params)
+                self.assertEqual(response.status_code, 200)
+                expected = self.expected_events(fields, expand)
+                self.assertEqual(response.content, self.render({**response.data, "events": expected}))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class EventCreateQueryCountTests(TestCase):
+    """Число запросов при создании мероприятия не зависит от числа устройств и работников."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username="admin", is_staff=True, is_superuser=True)
+        cls.services = [Service.objects.create(name="Фото"), Service.objects.create(name="Видео")]
+        cls.workers = [Workers.objects.create(name=f"Работник {i}", phone_number=f"+99892{i:07d}") for i in range(5)]
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def payload(self, index, devices_count):
+        return {
+            "client": {"name": f"Клиент {index}", "phones": [{"phone_number": f"+99893{index:07d}"}]},
+            "devices": [
+                {
+                    "service": self.services[i % 2].pk,
+                    "camera_count": i,
+                    "workers": [worker.pk for worker in self.workers[i % 2:i % 2 + 3]],
+                    "restaurant_name": "Ресторан",
+                    "event_service_date": "2025-06-01",
+                }
+                for i in range(devices_count)
+            ],
+            "amount": 10000,
+            "advance": 1000,
+        }
+
+    def create(self, index, devices_count):
+        response = self.api.post("/api/events/", self.payload(index, devices_count), format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_query_count_independent_of_devices(self):
+        with CaptureQueriesContext(connection) as single_device:
+            self.create(1, devices_count=1)
+        with self.assertNumQueries(len(single_device.captured_queries)):
+            self.create(2, devices_count=8)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class WorkerChangesVisibilityTests(EventsTestMixin, TestCase):
+    """Порядок и удаление работников видны в devices[].workers - их должны замечать ETag и дельта."""
+
+    EVENTS_COUNT = 6
+
+    def worker_with_devices(self):
+        return Workers.objects.filter(devices__isnull=False).distinct().first()
+
+    def reorder(self, worker):
+        response = self.api.post(
+            "/api/workers/update_order/", [{"id": worker.pk, "order": worker.order + 100}], format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_page_etag_changes_after_workers_reorder(self):
+        etag = self.api.get("/api/events/", {"page": 1})["ETag"]
+        self.reorder(self.worker_with_devices())
+        self.assertEqual(self.api.get("/api/events/", {"page": 1}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_page_etag_changes_after_worker_delete(self):
+        etag = self.api.get("/api/events/", {"page": 1})["ETag"]
+        self.worker_with_devices().delete()
+        self.assertEqual(self.api.get("/api/events/", {"page": 1}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def age_all_rows(self):
+        for model in (Client, PhoneClient, Event, Device, AdvanceHistory):
+            model.objects.update(updated_at=datetime(2025, 1, 1))
+
+    def delta_ids(self, updated_since):
+        response = self.api.get("/api/events/", {"updated_since": updated_since.isoformat(), "fields": "id"})
+        self.assertEqual(response.status_code, 200)
+        return {event["id"] for event in response.data["events"]}
+
+    def test_delta_includes_events_after_workers_reorder(self):
+        worker = self.worker_with_devices()
+        expected = set(Device.objects.filter(workers=worker).values_list("event_id", flat=True))
+        self.age_all_rows()
+        since = datetime.now() - timedelta(minutes=1)
+        self.assertEqual(self.delta_ids(since), set())
+        self.reorder(worker)
+        self.assertEqual(self.delta_ids(since), expected)
+
+    def test_delta_includes_events_after_worker_delete(self):
+        worker = self.worker_with_devices()
+        expected = set(Device.objects.filter(workers=worker).values_list("event_id", flat=True))
+        self.age_all_rows()
+        since = datetime.now() - timedelta(minutes=1)
+        worker.delete()
+        self.assertEqual(self.delta_ids(since), expected)
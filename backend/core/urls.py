@@ -4,9 +4,14 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import (
     ProtectedView,
     ClientAPIView,
+    search_clients,
+    lookup_phone,
     WorkerAPIView,
     ServiceAPIView,
     EventAPIView,
+    get_event_calendar,
+    import_events_view,
+    events_batch,
     UserListView,
     UserDetailView,
     ServiceDetailView,
@@ -34,6 +39,8 @@ urlpatterns = [
     path("users/", UserListView.as_view(), name="user-list"),  # Список всех пользователей
     path("users/<int:pk>/", UserDetailView.as_view(), name="user-detail"),  # Детали и обновление пользователя
     path("clients/", ClientAPIView.as_view(), name="client-list"),
+    path("clients/search/", search_clients, name="client-search"),
+    path("phones/lookup/", lookup_phone, name="phone-lookup"),
     path("clients/<int:pk>/", ClientAPIView.as_view(), name="client-detail"),
     path("workers/", WorkerAPIView.as_view(), name="worker-list"),
     path("workers/<int:pk>/", WorkerDetailView.as_view(), name="worker-detail"),
@@ -42,6 +49,9 @@ urlpatterns = [
     path("services/", ServiceAPIView.as_view(), name="service-list"),
     path("service/<int:pk>/", ServiceDetailView.as_view(), name="service-detail"),
     path("events/", EventAPIView.as_view(), name="event-list"),
+    path("events/calendar/", get_event_calendar, name="event-calendar"),
+    path("events/import/", import_events_view, name="event-import"),
+    path("events/batch/", events_batch, name="event-batch"),
     path("events/<int:pk>/", EventAPIView.as_view(), name="event-detail"),
     path("events/<int:pk>/update_advance/", update_advance, name="update_advance"),
     path("events/<int:pk>/history/", get_contract_history, name="contract_history"),
@@ -1,11 +1,20 @@
 import asyncio
 import logging
+import re
+from datetime import date, datetime, timedelta
 from django.core.exceptions import ValidationError
 from django.core.cache import cache
 from django.contrib.auth.models import User
-from django.utils.dateparse import parse_datetime
+from django.utils.dateparse import parse_date, parse_datetime
 from django.db import transaction
-from rest_framework import status
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import (
+    Case, Count, F, FloatField, IntegerField, OuterRef, Prefetch, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce, Greatest
+from rest_framework import serializers, status
 
 logger = logging.getLogger(__name__)
 from rest_framework.decorators import api_view, permission_classes
@@ -13,14 +22,22 @@ from rest_framework.generics import get_object_or_404, UpdateAPIView
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.pagination import PageNumberPagination
 
-from .models import Client, Workers, Service, Event, AdvanceHistory, TelegramContractLog, TelegramAdvanceNotificationLog, WorkerNotificationSettings, WorkerNotificationLog
+from .pagination import CreatedAtCursorPagination, EstimatedCountPagination, wants_cursor_pagination
+from .streaming import streaming_json_response
+from .conditional import compute_validator, not_modified_response, page_validator, with_validator
+from .archive import WithArchived, archived_queryset, include_archived, restore, retention_cutoff
+from .deletion import delete_clients, delete_events
+from .event_cache import CachedEventReadSerializer, touch_devices
+from .phones import normalize_phone_digits
+from .importer import IMPORT_FORMATS, import_events
+from .idempotency import idempotent
+from .models import Client, ClientHistory, PhoneClient, Workers, Service, Device, Event, EventHistory, EventTombstone, AdvanceHistory, TelegramContractLog, TelegramAdvanceNotificationLog, WorkerNotificationSettings, WorkerNotificationLog
 from .permissions import IsAdminOrReadOnly
 from .serializers import ClientSerializer, WorkersSerializer, ServiceSerializer, EventSerializer, UserSerializer, \
     AdvanceHistorySerializer, TelegramContractLogSerializer, TelegramAdvanceNotificationLogSerializer, WorkerDetailSerializer, \
     WorkerNotificationSettingsSerializer, WorkerNotificationLogSerializer, EventHistorySerializer, ClientHistorySerializer, \
-    PublicContractSerializer
+    PublicContractSerializer, EventFastReadSerializer, ClientStatsSerializer
 from .telegram_service import TelegramService
 from .message_templates import generate_contract_message, generate_advance_notification_message
 
@@ -43,6 +60,17 @@ def run_async_telegram(coro):
         return future.result()
 
 
+def get_sparse_fields(request):
+    """Разбирает ?fields= и ?expand= (через запятую). Не переданный параметр - None."""
+    def parse(name):
+        raw = request.query_params.get(name)
+        if raw is None:
+            return None
+        return [item.strip() for item in raw.split(',') if item.strip()]
+
+    return parse('fields'), parse('expand')
+
+
 class ProtectedView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -86,6 +114,41 @@ class UserDetailView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+# Поля, по которым можно сортировать список клиентов (?ordering=, с "-" - по убыванию).
+# Агрегаты доступны только вместе с ?stats=1.
+CLIENT_ORDERING_FIELDS = {"created_at", "name"}
+CLIENT_STATS_ORDERING_FIELDS = {
+    "events_count", "amount_uzs", "amount_usd", "advance_uzs", "advance_usd", "balance_uzs", "balance_usd",
+}
+
+
+def _client_events_aggregate(aggregate, **filters):
+    """Коррелированный подзапрос по мероприятиям клиента; 0, если мероприятий нет."""
+    events = Event.objects.filter(client=OuterRef('pk'), **filters).order_by().values('client')
+    return Coalesce(
+        Subquery(events.annotate(value=aggregate).values('value')), Value(0), output_field=IntegerField()
+    )
+
+
+def annotate_client_stats(clients):
+    """
+    Добавляет к клиентам агрегаты по их мероприятиям: количество, сумму договоров,
+    аванс и остаток, раздельно по валютам (amount_money/advance_money: False - сумы,
+    True - доллары). Каждый агрегат - подзапрос по индексу (client, created_at),
+    так что весь список считается одним SQL-запросом и по агрегатам можно сортировать.
+    """
+    return clients.annotate(
+        events_count=_client_events_aggregate(Count('pk')),
+        amount_uzs=_client_events_aggregate(Sum('amount'), amount_money=False),
+        amount_usd=_client_events_aggregate(Sum('amount'), amount_money=True),
+        advance_uzs=_client_events_aggregate(Sum('advance'), advance_money=False),
+        advance_usd=_client_events_aggregate(Sum('advance'), advance_money=True),
+        # Остаток считаем в валюте договора - так же, как в сообщениях (message_templates)
+        balance_uzs=_client_events_aggregate(Sum(F('amount') - F('advance')), amount_money=False),
+        balance_usd=_client_events_aggregate(Sum(F('amount') - F('advance')), amount_money=True),
+    )
+
+
 class ClientAPIView(APIView):
     """API для создания и получения клиентов."""
     permission_classes = [IsAdminUser]
@@ -94,8 +157,12 @@ class ClientAPIView(APIView):
         start_date = request.query_params.get("start_date")
         end_date = request.query_params.get("end_date")
 
-        # Оптимизация: prefetch_related для телефонов
-        clients = Client.objects.prefetch_related('phones').all()
+        # Разреженные поля: телефоны prefetch-им, только если они попадут в ответ
+        fields, expand = get_sparse_fields(request)
+        serializer_kwargs = {'fields': fields, 'expand': expand}
+        clients = Client.objects.all()
+        if 'phones' in ClientSerializer.selected_expandable(fields, expand):
+            clients = clients.prefetch_related('phones')
 
         if start_date and end_date:
             try:
@@ -105,20 +172,87 @@ class ClientAPIView(APIView):
             except (ValueError, TypeError):
                 return Response({"detail": "Неверный формат даты."}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Агрегаты по мероприятиям (?stats=1) и сортировка (?ordering=-balance_uzs)
+        with_stats = request.query_params.get('stats') in ('1', 'true')
+        ordering = request.query_params.get('ordering')
+        if ordering:
+            allowed = CLIENT_ORDERING_FIELDS | (CLIENT_STATS_ORDERING_FIELDS if with_stats else set())
+            if ordering.lstrip('-') not in allowed:
+                return Response(
+                    {"detail": f"Сортировка возможна только по полям: {', '.join(sorted(allowed))}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        serializer_class = ClientSerializer
+        if with_stats:
+            serializer_class = ClientStatsSerializer
+            clients = annotate_client_stats(clients)
+
+        return self.list_response(request, clients, serializer_class, ordering, serializer_kwargs)
+
+    def get_validator_querysets(self, client_ids, serializer_class, fields=None, expand=None):
+        """
+        Связи клиентов client_ids (список id или подзапрос), из которых собирается
+        ответ: телефоны - если они не исключены ?fields/?expand, мероприятия - для ?stats.
+        """
+        querysets = []
+        if 'phones' in ClientSerializer.selected_expandable(fields, expand):
+            querysets.append(PhoneClient.objects.filter(client__in=client_ids))
+        if serializer_class is ClientStatsSerializer:
+            querysets.append(Event.objects.filter(client__in=client_ids))
+        return querysets
+
+    def list_response(self, request, clients, serializer_class, ordering, serializer_kwargs):
+        """
+        Список с условным GET: если ни клиенты ответа, ни их телефоны (и мероприятия
+        для ?stats) не менялись - 304 без сериализации. Для страниц валидатор
+        считается по выбранным строкам страницы, а не по всей выборке.
+        """
+        # Курсорная пагинация (без COUNT и OFFSET) - по запросу ?pagination=cursor
+        if wants_cursor_pagination(request):
+            paginator = CreatedAtCursorPagination()
+            if ordering:
+                paginator.ordering = (ordering, 'id')
+            paginated_clients = paginator.paginate_queryset(clients, request)
+            return self.page_response(request, paginator, paginated_clients, serializer_class, serializer_kwargs)
+
+        if ordering:
+            clients = clients.order_by(ordering, 'id')
+
         # Применяем пагинацию только если запрошена (есть параметры page или page_size)
         page = request.query_params.get('page')
         page_size = request.query_params.get('page_size')
         
         if page or page_size:
-            paginator = PageNumberPagination()
+            paginator = EstimatedCountPagination()
             paginator.page_size = int(page_size) if page_size else 10
             paginated_clients = paginator.paginate_queryset(clients, request)
-            serializer = ClientSerializer(paginated_clients, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            return self.page_response(request, paginator, paginated_clients, serializer_class, serializer_kwargs)
         else:
-            # Без пагинации - возвращаем все результаты
-            serializer = ClientSerializer(clients, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            # Без пагинации в ответ попадает вся выборка, так что и валидатор - по ней
+            validator = compute_validator(
+                request, clients,
+                *self.get_validator_querysets(clients.order_by().values('pk'), serializer_class, **serializer_kwargs),
+            )
+            not_modified = not_modified_response(request, validator)
+            if not_modified is not None:
+                return not_modified
+            # Без пагинации - отдаём все результаты потоком, по чанкам
+            if not ordering:
+                clients = clients.order_by('-created_at', 'id')
+            response = streaming_json_response(clients, serializer_class, **serializer_kwargs)
+            return with_validator(response, validator)
+
+    def page_response(self, request, paginator, clients, serializer_class, serializer_kwargs):
+        client_ids = [client.pk for client in clients]
+        validator = page_validator(
+            request, paginator, [(client.pk, client.updated_at) for client in clients],
+            *self.get_validator_querysets(client_ids, serializer_class, **serializer_kwargs),
+        )
+        not_modified = not_modified_response(request, validator)
+        if not_modified is not None:
+            return not_modified
+        serializer = serializer_class(clients, many=True, **serializer_kwargs)
+        return with_validator(paginator.get_paginated_response(serializer.data), validator)
 
     def post(self, request):
         serializer = ClientSerializer(data=request.data)
@@ -136,11 +270,87 @@ class ClientAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
-        client = get_object_or_404(Client, pk=pk)
-        client.delete()
+        client = get_object_or_404(Client.objects.only('id'), pk=pk)
+        delete_clients([client.pk])
         return Response({"detail": "Client deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
 
 
+# Лимиты поиска клиентов: сколько результатов отдаём по умолчанию и максимум
+CLIENT_SEARCH_DEFAULT_LIMIT = 20
+CLIENT_SEARCH_MAX_LIMIT = 50
+# Подстрока номера короче этого даёт слишком много совпадений
+CLIENT_SEARCH_MIN_PHONE_DIGITS = 3
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def search_clients(request):
+    """
+    Серверный поиск клиентов: нечёткое совпадение по имени (pg_trgm similarity
+    или ILIKE-подстрока) и поиск по подстроке цифр номера телефона. Оба условия
+    обслуживаются GIN-индексами gin_trgm_ops, результаты ранжируются (совпадение
+    по телефону - максимальный ранг, дальше по похожести имени) и ограничены limit.
+    """
+    query = (request.query_params.get('q') or '').strip()
+    try:
+        limit = min(int(request.query_params.get('limit', CLIENT_SEARCH_DEFAULT_LIMIT)), CLIENT_SEARCH_MAX_LIMIT)
+    except ValueError:
+        return Response({"detail": "limit должен быть числом."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(query) < 2 or limit < 1:
+        return Response([], status=status.HTTP_200_OK)
+
+    matches = Q(name__trigram_similar=query) | Q(name__ilike_contains=query)
+    rank = TrigramSimilarity('name', query)
+
+    digits = re.sub(r'\D', '', query)
+    if len(digits) >= CLIENT_SEARCH_MIN_PHONE_DIGITS:
+        phone_client_ids = PhoneClient.objects.filter(phone_number__contains=digits).values('client_id')
+        matches |= Q(pk__in=phone_client_ids)
+        rank = Greatest(
+            rank,
+            Case(When(pk__in=phone_client_ids, then=Value(1.0)), default=Value(0.0), output_field=FloatField()),
+        )
+
+    clients = (
+        Client.objects.filter(matches)
+        .annotate(rank=rank)
+        .order_by('-rank', 'id')
+        .prefetch_related('phones')[:limit]
+    )
+    serializer = ClientSerializer(clients, many=True)
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def lookup_phone(request):
+    """
+    Обратный поиск по номеру: какие клиенты, работники и мероприятия владеют
+    этим номером. Номер нормализуется так же, как при сохранении (phone_digits),
+    поэтому формат ввода не важен, а каждый поиск - одно обращение к индексу.
+    """
+    digits = normalize_phone_digits(request.query_params.get('phone'))
+    if not digits:
+        return Response({"detail": "Параметр phone обязателен."}, status=status.HTTP_400_BAD_REQUEST)
+
+    client_ids = PhoneClient.objects.filter(phone_digits=digits).values('client_id')
+    clients = list(Client.objects.filter(pk__in=client_ids).order_by('id').values('id', 'name', 'is_vip', 'is_archived'))
+    workers = list(Workers.objects.filter(phone_digits=digits).order_by('id').values('id', 'name'))
+    events = list(
+        Event.objects.filter(client_id__in=client_ids)
+        .order_by('-created_at', 'id')
+        .values('id', 'client_id', 'amount', 'advance', 'created_at')
+    )
+
+    return Response({
+        "phone": f"+{digits}",
+        "clients": clients,
+        "workers": workers,
+        "events": events,
+    }, status=status.HTTP_200_OK)
+
+
 class WorkerAPIView(APIView):
     serializer_class = WorkersSerializer
     permission_classes = [IsAdminOrReadOnly]
@@ -148,8 +358,21 @@ class WorkerAPIView(APIView):
     def get(self, request):
         # Оптимизация: используем отсортированный queryset
         workers = Workers.objects.all().order_by('order')
+
+        # has_event_today/has_event_tomorrow зависят от даты и устройств на эти два дня
+        today = date.today()
+        validator = compute_validator(
+            request,
+            workers,
+            Device.objects.filter(event_service_date__in=[today, today + timedelta(days=1)]),
+            extra=today,
+        )
+        not_modified = not_modified_response(request, validator)
+        if not_modified is not None:
+            return not_modified
+
         serializer = WorkersSerializer(workers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return with_validator(Response(serializer.data, status=status.HTTP_200_OK), validator)
 
     def post(self, request):
         serializer = WorkersSerializer(data=request.data)
@@ -173,17 +396,21 @@ def update_workers_order(request):
         # Получаем все объекты одним запросом
         workers = {w.id: w for w in Workers.objects.filter(id__in=worker_ids)}
         
-        # Обновляем порядок
+        # Обновляем порядок (только тех, у кого он действительно изменился)
         workers_to_update = []
         for worker_data in workers_order:
             worker_id = worker_data['id']
-            if worker_id in workers:
+            if worker_id in workers and workers[worker_id].order != worker_data['order']:
                 worker = workers[worker_id]
                 worker.order = worker_data['order']
                 workers_to_update.append(worker)
         
-        # Bulk update - один запрос вместо N
-        Workers.objects.bulk_update(workers_to_update, ['order'])
+        with transaction.atomic():
+            # Bulk update - один запрос вместо N
+            Workers.objects.bulk_update(workers_to_update, ['order'])
+
+            # bulk_update не шлёт сигналы, а порядок работников виден в devices[].workers
+            touch_devices(Device.objects.filter(workers__in=workers_to_update))
         
         return Response({'message': 'Порядок работников обновлен'}, status=status.HTTP_200_OK)
     except Exception as e:
@@ -224,12 +451,18 @@ def update_services_order(request):
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def get_contract_history(request, pk):
-    """История изменений договора: собственные поля Event + изменения его клиента (имя, телефоны)."""
+    """
+    История изменений договора: собственные поля Event + изменения его клиента (имя, телефоны).
+    С ?include_archived=1 - вместе с записями, перенесёнными в архив (core/archive.py).
+    """
 
     event = get_object_or_404(Event, pk=pk)
 
-    event_history = event.history.select_related('changed_by').all()
-    client_history = event.client.history.select_related('changed_by').all()
+    event_history = list(event.history.select_related('changed_by').all())
+    client_history = list(event.client.history.select_related('changed_by').all())
+    if include_archived(request):
+        event_history += restore(EventHistory, archived_queryset(EventHistory, owner_ids=[event.pk]))
+        client_history += restore(ClientHistory, archived_queryset(ClientHistory, owner_ids=[event.client_id]))
 
     entries = EventHistorySerializer(event_history, many=True).data + ClientHistorySerializer(client_history, many=True).data
     entries.sort(key=lambda entry: entry['changed_at'], reverse=True)
@@ -251,9 +484,10 @@ def update_advance(request, pk):
         return Response({"error": "Некорректные данные"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        amount = float(amount)
-    except ValueError:
-        return Response({"error": "Сумма должна быть числом"}, status=status.HTTP_400_BAD_REQUEST)
+        # Аванс хранится в целых суммах: "100.7" - ошибка, а не тихое округление до 100
+        amount = serializers.IntegerField(min_value=1).run_validation(amount)
+    except serializers.ValidationError:
+        return Response({"error": "Сумма должна быть целым положительным числом"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
         # Используем метод из модели
@@ -272,6 +506,18 @@ class WorkerDetailView(UpdateAPIView):
 
     def get(self, request, pk):
         """Получение детальной информации о работнике с его задачами и мероприятиями."""
+        validator = compute_validator(
+            request,
+            Workers.objects.filter(pk=pk),
+            Device.objects.filter(workers=pk),
+            Event.objects.filter(devices__workers=pk),
+            Client.objects.filter(events__devices__workers=pk),
+            Service.objects.filter(devices__workers=pk),
+        )
+        not_modified = not_modified_response(request, validator)
+        if not_modified is not None:
+            return not_modified
+
         worker = get_object_or_404(
             Workers.objects.prefetch_related(
                 'devices__service',
@@ -282,7 +528,7 @@ class WorkerDetailView(UpdateAPIView):
             pk=pk
         )
         serializer = WorkerDetailSerializer(worker)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return with_validator(Response(serializer.data, status=status.HTTP_200_OK), validator)
 
     def delete(self, request, pk):
         worker = get_object_or_404(Workers, pk=pk)
@@ -295,6 +541,11 @@ class ServiceAPIView(APIView):
     permission_classes = [IsAdminOrReadOnly]
 
     def get(self, request):
+        validator = compute_validator(request, Service.objects.all())
+        not_modified = not_modified_response(request, validator)
+        if not_modified is not None:
+            return not_modified
+
         # Оптимизация: кэширование списка услуг
         cache_key = 'services_list'
         cached_data = cache.get(cache_key)
@@ -306,7 +557,7 @@ class ServiceAPIView(APIView):
             cached_data = serializer.data
             cache.set(cache_key, cached_data, 300)  # Кэш на 5 минут
         
-        return Response(cached_data, 200)
+        return with_validator(Response(cached_data, 200), validator)
 
     def post(self, request):
         serializer = ServiceSerializer(data=request.data)
@@ -337,37 +588,73 @@ class ServiceDetailView(UpdateAPIView):
         return Response({"detail": "Service deleted successfully."}, 204)
 
 
+# На сколько server_time дельта-синхронизации отстаёт от момента ответа: запас на
+# транзакции, которые начались раньше, а закоммитились уже после выборки
+DELTA_SYNC_OVERLAP = timedelta(minutes=5)
+
+
 class EventAPIView(APIView):
     """API для работы с мероприятиями."""
     permission_classes = [IsAdminOrReadOnly]
 
+    # Какие prefetch нужны каждой вложенной связи EventSerializer
+    EXPAND_PREFETCHES = {
+        'client': ('client__phones',),
+        # Порядок устройств задаём явно - тот же, что у EventFastReadSerializer
+        'devices': (Prefetch('devices', queryset=Device.objects.order_by('id')), 'devices__service', 'devices__workers'),
+        'advance_history': ('advance_history',),
+    }
+
+    def get_event_queryset(self, fields=None, expand=None):
+        """select_related/prefetch_related только для тех связей, которые попадут в ответ."""
+        events = Event.objects.all()
+        expanded = EventSerializer.selected_expandable(fields, expand)
+        if 'client' in expanded:
+            events = events.select_related('client')
+        prefetches = [
+            lookup
+            for name, lookups in self.EXPAND_PREFETCHES.items() if name in expanded
+            for lookup in lookups
+        ]
+        if prefetches:
+            events = events.prefetch_related(*prefetches)
+        return events
+
+    def get_validator_querysets(self, event_ids, fields=None, expand=None):
+        """
+        Вложенные связи мероприятий event_ids (список id или подзапрос), из которых
+        собирается ответ. Связи, которые ?fields/?expand исключили, не проверяем.
+        """
+        expanded = EventSerializer.selected_expandable(fields, expand)
+        querysets = []
+        if 'client' in expanded:
+            querysets.append(Client.objects.filter(events__in=event_ids))
+            querysets.append(PhoneClient.objects.filter(client__events__in=event_ids))
+        if 'devices' in expanded:
+            querysets.append(Device.objects.filter(event__in=event_ids))
+        if 'advance_history' in expanded:
+            querysets.append(AdvanceHistory.objects.filter(event__in=event_ids))
+        return querysets
+
     def get(self, request, pk=None):
         start_date_str = request.query_params.get("start_date")
         end_date_str = request.query_params.get("end_date")
+        fields, expand = get_sparse_fields(request)
+        serializer_kwargs = {'fields': fields, 'expand': expand}
 
         if pk:
-            # Оптимизация: select_related для client, prefetch_related для связанных объектов
-            event = get_object_or_404(
-                Event.objects.select_related('client')
-                .prefetch_related(
-                    'client__phones',
-                    'devices__service',
-                    'devices__workers',
-                    'advance_history'
-                ),
-                pk=pk
+            validator = compute_validator(
+                request, Event.objects.filter(pk=pk), *self.get_validator_querysets([pk], fields, expand)
             )
-            serializer = EventSerializer(event)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            not_modified = not_modified_response(request, validator)
+            if not_modified is not None:
+                return not_modified
+            event = get_object_or_404(self.get_event_queryset(fields, expand), pk=pk)
+            serializer = EventSerializer(event, **serializer_kwargs)
+            return with_validator(Response(serializer.data, status=status.HTTP_200_OK), validator)
 
-        # Оптимизация: select_related и prefetch_related для списка событий
         # Сортируем по дате создания (сначала новые)
-        events = Event.objects.select_related('client').prefetch_related(
-            'client__phones',
-            'devices__service',
-            'devices__workers',
-            'advance_history'
-        ).order_by('-created_at')
+        events = self.get_event_queryset(fields, expand).order_by('-created_at')
 
         if start_date_str and end_date_str:
             try:
@@ -377,40 +664,139 @@ class EventAPIView(APIView):
             except (ValueError, TypeError):
                 return Response({"detail": "Неверный формат даты."}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Дельта-синхронизация: только изменённые мероприятия + id удалённых
+        updated_since_str = request.query_params.get("updated_since")
+        if updated_since_str:
+            return self.delta_response(request, events, updated_since_str, serializer_kwargs)
+
+        return self.list_response(request, events, serializer_kwargs)
+
+    def delta_response(self, request, events, updated_since_str, serializer_kwargs):
+        """
+        Мероприятия, у которых с момента updated_since изменилась собственная строка
+        или любая вложенная (клиент, телефоны, устройства, история аванса), плюс
+        список id удалённых мероприятий. Клиент передаёт server_time из ответа
+        следующим updated_since, так что опрос стоит O(изменений), а не O(всех событий).
+
+        server_time отстаёт на DELTA_SYNC_OVERLAP, поэтому соседние ответы
+        перекрываются: клиент должен быть готов к повторам и обновлять мероприятия
+        по id. Если updated_since старше срока хранения отметок об удалении
+        (ARCHIVE_RETENTION_MONTHS["EventTombstone"]), часть удалений уже не
+        восстановить - отвечаем 410, и клиент загружает список заново.
+        """
+        try:
+            updated_since = parse_datetime(updated_since_str)
+        except ValueError:
+            updated_since = None
+        if updated_since is None:
+            return Response({"detail": "Неверный формат updated_since."}, status=status.HTTP_400_BAD_REQUEST)
+        # USE_TZ = False: время со смещением приводим к локальному наивному
+        if timezone.is_aware(updated_since):
+            updated_since = timezone.make_naive(updated_since)
+
+        tombstones_cutoff = retention_cutoff(EventTombstone)
+        if tombstones_cutoff is not None and updated_since < tombstones_cutoff:
+            return Response(
+                {"detail": "updated_since старше срока хранения удалений, нужна полная синхронизация."},
+                status=status.HTTP_410_GONE,
+            )
+
+        # Время фиксируем до выборки (с запасом DELTA_SYNC_OVERLAP), чтобы изменения во время
+        # запроса попали в следующий опрос. Сравниваем через >=: server_time отдаётся с точностью до секунды.
+        server_time = datetime.now() - DELTA_SYNC_OVERLAP
+        changed = (
+            Q(updated_at__gte=updated_since)
+            | Q(client__updated_at__gte=updated_since)
+            | Q(client_id__in=PhoneClient.objects.filter(updated_at__gte=updated_since).values('client_id'))
+            | Q(pk__in=Device.objects.filter(updated_at__gte=updated_since).values('event_id'))
+            | Q(pk__in=AdvanceHistory.objects.filter(updated_at__gte=updated_since).values('event_id'))
+        )
+        events = events.filter(changed).prefetch_related(None).order_by('-created_at', 'id')
+        deleted = EventTombstone.objects.filter(deleted_at__gte=updated_since).values_list('event_id', flat=True)
+
+        return Response({
+            "server_time": serializers.DateTimeField().to_representation(server_time),
+            "events": CachedEventReadSerializer(
+                events.values(*EventFastReadSerializer.event_values), many=True, **serializer_kwargs
+            ).data,
+            "deleted": sorted(set(deleted)),
+        }, status=status.HTTP_200_OK)
+
+    def list_response(self, request, events, serializer_kwargs):
+        """
+        Список с условным GET: если ничего из ответа не менялось - 304 без
+        сериализации. Для страниц валидатор считается по уже выбранным строкам
+        страницы и их вложенным связям, а не по всей выборке.
+        """
+        # Списки собираем из values()-строк: готовые представления берём из кэша,
+        # промахи - быстрым read-only сериализатором, который сам выбирает вложенные
+        # связи одной пачкой, поэтому prefetch здесь не нужен.
+        events = events.prefetch_related(None)
+        rows = events.values(*EventFastReadSerializer.event_values)
+
+        # Курсорная пагинация (без COUNT и OFFSET) - по запросу ?pagination=cursor
+        if wants_cursor_pagination(request):
+            paginator = CreatedAtCursorPagination()
+            return self.page_response(request, paginator, paginator.paginate_queryset(rows, request), serializer_kwargs)
+
         # Применяем пагинацию только если запрошена (есть параметры page или page_size)
         page = request.query_params.get('page')
         page_size = request.query_params.get('page_size')
         
         if page or page_size:
-            paginator = PageNumberPagination()
+            paginator = EstimatedCountPagination()
             paginator.page_size = int(page_size) if page_size else 10
-            paginated_events = paginator.paginate_queryset(events, request)
-            serializer = EventSerializer(paginated_events, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            return self.page_response(request, paginator, paginator.paginate_queryset(rows, request), serializer_kwargs)
         else:
-            # Без пагинации - возвращаем все результаты
-            serializer = EventSerializer(events, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            # Без пагинации в ответ попадает вся выборка, так что и валидатор - по ней
+            validator = compute_validator(
+                request, events, *self.get_validator_querysets(events.order_by().values('pk'), **serializer_kwargs)
+            )
+            not_modified = not_modified_response(request, validator)
+            if not_modified is not None:
+                return not_modified
+            # Без пагинации - отдаём все результаты потоком, по чанкам
+            response = streaming_json_response(
+                rows.order_by('-created_at', 'id'), CachedEventReadSerializer, **serializer_kwargs
+            )
+            return with_validator(response, validator)
+
+    def page_response(self, request, paginator, rows, serializer_kwargs):
+        event_ids = [row['id'] for row in rows]
+        validator = page_validator(
+            request, paginator, [(row['id'], row['updated_at']) for row in rows],
+            *self.get_validator_querysets(event_ids, **serializer_kwargs),
+        )
+        not_modified = not_modified_response(request, validator)
+        if not_modified is not None:
+            return not_modified
+        serializer = CachedEventReadSerializer(rows, many=True, **serializer_kwargs)
+        return with_validator(paginator.get_paginated_response(serializer.data), validator)
+
+    def saved_event_data(self, event):
+        """Ответ после записи: мероприятие заново с prefetch, а не запросы на каждое устройство."""
+        return EventSerializer(self.get_event_queryset().get(pk=event.pk)).data
 
+    @method_decorator(idempotent)
     def post(self, request):
         serializer = EventSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data, 201)
+        event = serializer.save()
+        return Response(self.saved_event_data(event), 201)
 
     def put(self, request, pk):
         event = get_object_or_404(Event, pk=pk)
         serializer = EventSerializer(event, data=request.data)
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            event = serializer.save()
+            return Response(self.saved_event_data(event), status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
-        event = get_object_or_404(Event, pk=pk)
+        event = get_object_or_404(Event.objects.only('id'), pk=pk)
 
-        # Удаление всех связанных устройств через каскадное удаление
-        event.delete()
+        # Устройства, историю и логи удаляет каскадом сама БД (core/deletion.py)
+        delete_events([event.pk])
 
         return Response(
             {"detail": "Event and its related devices deleted successfully."}, status=status.HTTP_204_NO_CONTENT
@@ -419,6 +805,221 @@ class EventAPIView(APIView):
 
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
+def import_events_view(request):
+    """
+    Массовый импорт мероприятий из файла (multipart, поле file): CSV или JSON Lines,
+    формат - ?file_format=csv|jsonl или по расширению файла
+    (не ?format=: его DRF использует для выбора рендерера). Всё загружается в одной
+    транзакции; при ошибках в строках ничего не импортируется, если не передан
+    ?skip_invalid=1. В ответе - число созданных мероприятий и ошибки по строкам.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({"detail": "Передайте файл в поле file."}, status=status.HTTP_400_BAD_REQUEST)
+
+    file_format = request.query_params.get('file_format') or upload.name.rsplit('.', 1)[-1].lower()
+    if file_format not in IMPORT_FORMATS:
+        return Response(
+            {"detail": f"Поддерживаемые форматы: {', '.join(IMPORT_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    skip_invalid = request.query_params.get('skip_invalid') in ('1', 'true')
+    try:
+        result = import_events(upload, file_format, skip_invalid=skip_invalid)
+    except UnicodeDecodeError:
+        return Response({"detail": "Файл должен быть в кодировке UTF-8."}, status=status.HTTP_400_BAD_REQUEST)
+    response_status = status.HTTP_201_CREATED if result["committed"] else status.HTTP_400_BAD_REQUEST
+    return Response(result, status=response_status)
+
+
+# Сколько операций можно передать в одном запросе к /events/batch/
+EVENT_BATCH_MAX_OPERATIONS = 100
+EVENT_BATCH_OPERATIONS = ('create', 'update', 'delete')
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def events_batch(request):
+    """
+    Несколько операций с мероприятиями одним запросом:
+    [{"op": "create", "data": {...}}, {"op": "update", "id": 1, "data": {...}}, {"op": "delete", "id": 2}].
+
+    Все операции сначала валидируются вместе: изменяемые мероприятия с клиентами
+    загружаются одним запросом, услуги и работники всех устройств - по одному на
+    таблицу. Если хотя бы одна операция некорректна, не применяется ни одна (400).
+    Иначе всё выполняется в одной транзакции, в ответе - результат по каждой операции.
+    """
+    operations = request.data
+    if not isinstance(operations, list) or not operations:
+        return Response({"detail": "Ожидается непустой список операций."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(operations) > EVENT_BATCH_MAX_OPERATIONS:
+        return Response(
+            {"detail": f"Не больше {EVENT_BATCH_MAX_OPERATIONS} операций за запрос."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    event_ids = []
+    for operation in operations:
+        if isinstance(operation, dict) and operation.get('op') in ('update', 'delete'):
+            try:
+                event_ids.append(int(operation.get('id')))
+            except (TypeError, ValueError):
+                pass
+    events = Event.objects.select_related('client').in_bulk(event_ids)
+    context = {'prefetched': EventSerializer.prefetch_device_relations(
+        [operation.get('data') for operation in operations if isinstance(operation, dict)]
+    )}
+
+    results = []
+    prepared = []
+    seen_ids = set()
+    has_errors = False
+    for index, operation in enumerate(operations):
+        result = {'index': index}
+        results.append(result)
+        op = operation.get('op') if isinstance(operation, dict) else None
+        result['op'] = op
+        if op not in EVENT_BATCH_OPERATIONS:
+            result['errors'] = {"op": [f"Ожидается одно из: {', '.join(EVENT_BATCH_OPERATIONS)}."]}
+            has_errors = True
+            continue
+
+        event = None
+        if op in ('update', 'delete'):
+            try:
+                event = events.get(int(operation.get('id')))
+            except (TypeError, ValueError):
+                pass
+            if event is None:
+                result['errors'] = {"id": ["Мероприятие не найдено."]}
+                has_errors = True
+                continue
+            if event.pk in seen_ids:
+                result['errors'] = {"id": ["Мероприятие уже изменяется другой операцией этого запроса."]}
+                has_errors = True
+                continue
+            seen_ids.add(event.pk)
+            result['id'] = event.pk
+            if op == 'delete':
+                prepared.append((result, op, event))
+                continue
+
+        serializer = EventSerializer(event, data=operation.get('data'), context=context)
+        if not serializer.is_valid():
+            result['errors'] = serializer.errors
+            has_errors = True
+            continue
+        prepared.append((result, op, serializer))
+
+    if has_errors:
+        return Response({"results": results}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        delete_ids = [target.pk for _, op, target in prepared if op == 'delete']
+        if delete_ids:
+            delete_events(delete_ids)
+        for result, op, target in prepared:
+            if op != 'delete':
+                result['id'] = target.save().pk
+
+    # Ответ по созданным/изменённым мероприятиям - одной выборкой с prefetch
+    saved_ids = [result['id'] for result, op, _ in prepared if op != 'delete']
+    saved = EventAPIView().get_event_queryset().in_bulk(saved_ids)
+    for result, op, _ in prepared:
+        result['status'] = {'create': 'created', 'update': 'updated', 'delete': 'deleted'}[op]
+        if op != 'delete':
+            result['data'] = EventSerializer(saved[result['id']]).data
+    return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+# Максимальная ширина окна календаря - чуть больше года, чтобы один запрос
+# не превращался обратно в выгрузку всей истории.
+CALENDAR_MAX_DAYS = 400
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminOrReadOnly])
+def get_event_calendar(request):
+    """
+    Компактная лента календаря: одна плоская строка на устройство с
+    event_service_date в диапазоне [from, to]. Вместо полного EventSerializer
+    с вложенными клиентом, телефонами и историей аванса отдаём только то, что
+    нужно для отрисовки ячейки календаря, поэтому объём ответа и время в БД
+    зависят от видимого окна, а не от всей истории мероприятий.
+    """
+    try:
+        date_from = parse_date(request.query_params.get('from') or '')
+        date_to = parse_date(request.query_params.get('to') or '')
+    except ValueError:
+        date_from = date_to = None
+
+    if not date_from or not date_to:
+        return Response(
+            {"detail": "Параметры from и to обязательны в формате YYYY-MM-DD."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if date_from > date_to:
+        return Response({"detail": "Дата from не может быть позже to."}, status=status.HTTP_400_BAD_REQUEST)
+    if (date_to - date_from).days > CALENDAR_MAX_DAYS:
+        return Response(
+            {"detail": f"Диапазон не может превышать {CALENDAR_MAX_DAYS} дней."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Один запрос по индексу (event_service_date, event) + JOIN на клиента и услугу
+    rows = list(
+        Device.objects.filter(event_service_date__range=[date_from, date_to])
+        .order_by('event_service_date', 'event_id', 'id')
+        .values(
+            'id',
+            'event_id',
+            'event_service_date',
+            'restaurant_name',
+            'service_id',
+            'service__color',
+            'event__client_id',
+            'event__client__name',
+        )
+    )
+
+    # Второй запрос - только id работников из through-таблицы, без загрузки Workers
+    workers_by_device = {}
+    if rows:
+        links = Device.workers.through.objects.filter(
+            device_id__in=[row['id'] for row in rows]
+        ).values_list('device_id', 'workers_id')
+        for device_id, worker_id in links:
+            workers_by_device.setdefault(device_id, []).append(worker_id)
+
+    # Третий - номера клиентов окна, для поиска по телефону в календаре
+    phones_by_client = {}
+    if rows:
+        phones = PhoneClient.objects.filter(
+            client_id__in={row['event__client_id'] for row in rows}
+        ).values_list('client_id', 'phone_number')
+        for client_id, phone_number in phones:
+            phones_by_client.setdefault(client_id, []).append(phone_number)
+
+    data = [
+        {
+            "device_id": row['id'],
+            "event_id": row['event_id'],
+            "date": row['event_service_date'],
+            "client_name": row['event__client__name'],
+            "client_phones": phones_by_client.get(row['event__client_id'], []),
+            "service_id": row['service_id'],
+            "service_color": row['service__color'],
+            "restaurant_name": row['restaurant_name'],
+            "workers": workers_by_device.get(row['id'], []),
+        }
+        for row in rows
+    ]
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+@idempotent
 def send_event_contract(request, pk):
     """Отправка договора в Telegram."""
     
@@ -498,11 +1099,13 @@ def send_event_contract(request, pk):
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def get_contract_logs(request, pk):
-    """Получение истории отправок договоров."""
+    """Получение истории отправок договоров (с ?include_archived=1 - вместе с архивом)."""
     
     event = get_object_or_404(Event, pk=pk)
     # Оптимизация: используем select_related если нужно, но здесь не требуется
     logs = TelegramContractLog.objects.filter(event=event).order_by('-sent_at')
+    if include_archived(request):
+        logs = list(WithArchived(logs, archived_queryset(TelegramContractLog, owner_ids=[event.pk])))
     serializer = TelegramContractLogSerializer(logs, many=True)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -522,6 +1125,7 @@ def get_public_contract(request, token):
 
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
+@idempotent
 def send_advance_notification(request, pk):
     """Отправка уведомления об авансе в Telegram."""
     
@@ -614,11 +1218,13 @@ def send_advance_notification(request, pk):
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def get_advance_notification_logs(request, pk):
-    """Получение истории отправок уведомлений об авансе."""
+    """Получение истории отправок уведомлений об авансе (с ?include_archived=1 - вместе с архивом)."""
     
     event = get_object_or_404(Event, pk=pk)
     # Оптимизация: используем индексы для быстрого поиска
     logs = TelegramAdvanceNotificationLog.objects.filter(event=event).order_by('-sent_at')
+    if include_archived(request):
+        logs = list(WithArchived(logs, archived_queryset(TelegramAdvanceNotificationLog, owner_ids=[event.pk])))
     serializer = TelegramAdvanceNotificationLogSerializer(logs, many=True)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -654,13 +1260,17 @@ def worker_notification_settings(request):
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def get_worker_notification_logs(request):
-    """Получение истории отправки уведомлений работникам."""
+    """
+    Получение истории отправки уведомлений работникам.
+    С ?include_archived=1 - вместе с архивом, с теми же фильтрами и пагинацией.
+    """
     
     worker_id = request.query_params.get('worker_id')
     event_date = request.query_params.get('event_date')
     notification_type = request.query_params.get('notification_type')
     
     logs = WorkerNotificationLog.objects.all().select_related('worker').order_by('-sent_at')
+    archived_filters = {}
     
     # Фильтрация по работнику
     if worker_id:
@@ -669,17 +1279,25 @@ def get_worker_notification_logs(request):
     # Фильтрация по дате мероприятия
     if event_date:
         logs = logs.filter(event_date=event_date)
+        archived_filters['event_date'] = event_date
     
     # Фильтрация по типу уведомления
     if notification_type:
         logs = logs.filter(notification_type=notification_type)
+        archived_filters['notification_type'] = notification_type
+    
+    if include_archived(request):
+        archived = archived_queryset(
+            WorkerNotificationLog, owner_ids=[worker_id] if worker_id else None, **archived_filters
+        )
+        logs = WithArchived(logs, archived)
     
     # Применяем пагинацию
     page = request.query_params.get('page')
     page_size = request.query_params.get('page_size')
     
     if page or page_size:
-        paginator = PageNumberPagination()
+        paginator = EstimatedCountPagination()
         paginator.page_size = int(page_size) if page_size else 20
         paginated_logs = paginator.paginate_queryset(logs, request)
         serializer = WorkerNotificationLogSerializer(paginated_logs, many=True)
@@ -49,6 +49,11 @@ api.interceptors.response.use(
     }
 );
 
+// Заголовок Idempotency-Key: повтор запроса с тем же ключом сервер не выполняет
+// заново, а возвращает сохранённый ответ. Ключ живёт до первого успешного ответа.
+export const newIdempotencyKey = () => crypto.randomUUID();
+const idempotencyConfig = (key) => (key ? { headers: { "Idempotency-Key": key } } : {});
+
 // User
 export const login = (username, password) => api.post("/token/", {username, password});
 export const getUsers = () => api.get("/users/");
@@ -60,6 +65,12 @@ export const deleteUser = id => api.delete(`/users/${id}/`);
 // Clients
 export const getClients = (page = 1, pageSize = 10) => 
     api.get("/clients/", { params: { page, page_size: pageSize } });
+// Клиенты с агрегатами по мероприятиям (количество, суммы, аванс, остаток по валютам);
+// ordering - например "-balance_uzs"
+export const getClientsWithStats = (page = 1, pageSize = 10, ordering) =>
+    api.get("/clients/", { params: { page, page_size: pageSize, stats: 1, ordering } });
+// Серверный поиск клиентов по имени и цифрам номера телефона
+export const searchClients = (q, limit = 20) => api.get("/clients/search/", { params: { q, limit } });
 export const createClient = (data) => api.post("/clients/", data);
 export const updateClient = (id, data) => api.put(`/clients/${id}/`, data);
 export const deleteClient = (id) => api.delete(`/clients/${id}/`);
@@ -74,8 +85,19 @@ export const getEvents = (page = 1, pageSize = 10, usePagination = true) => {
     return api.get("/events/", { params });
 };
 export const getEventById = (id) => api.get(`/events/${id}/`);
-export const createEvent = (data) => api.post("/events/", data);
+// Компактная лента календаря: from/to в формате YYYY-MM-DD (по дате услуги)
+export const getEventCalendar = (from, to) => api.get("/events/calendar/", { params: { from, to } });
+export const createEvent = (data, idempotencyKey) => api.post("/events/", data, idempotencyConfig(idempotencyKey));
+// Массовый импорт мероприятий из CSV/JSONL-файла; skipInvalid - загрузить корректные строки, пропустив ошибочные
+export const importEvents = (file, skipInvalid = false) => {
+    const formData = new FormData();
+    formData.append("file", file);
+    return api.post("/events/import/", formData, { params: skipInvalid ? { skip_invalid: 1 } : {} });
+};
 export const updateEvent = (id, data) => api.put(`/events/${id}/`, data);
+// Несколько операций одним запросом и одной транзакцией:
+// [{op: "create", data}, {op: "update", id, data}, {op: "delete", id}]
+export const batchEvents = (operations) => api.post("/events/batch/", operations);
 export const updateEventAdvance = (id, advanceData) => api.post(`/events/${id}/update_advance/`, advanceData);
 export const deleteEvent = (id) => api.delete(`/events/${id}/`);
 
@@ -94,12 +116,15 @@ export const updateService = (id, data) => api.put(`/service/${id}/`, data);
 export const updateServicesOrder = (data) => api.post("/services/update_order/", data);
 
 // Telegram contract sending (backend endpoint ожидается как POST /events/{id}/send_contract/)
-export const sendEventContract = (eventId, phone) =>
-  api.post(`/events/${eventId}/send_contract/`, phone ? { phone } : {});
+export const sendEventContract = (eventId, phone, idempotencyKey) =>
+  api.post(`/events/${eventId}/send_contract/`, phone ? { phone } : {}, idempotencyConfig(idempotencyKey));
+
+// Вместе с записями, перенесёнными в архив по сроку хранения
+const archivedParams = (includeArchived) => (includeArchived ? { params: { include_archived: 1 } } : {});
 
 // История отправок договора (GET /events/{id}/contract_logs/)
-export const getEventContractLogs = (eventId) =>
-  api.get(`/events/${eventId}/contract_logs/`);
+export const getEventContractLogs = (eventId, includeArchived = false) =>
+  api.get(`/events/${eventId}/contract_logs/`, archivedParams(includeArchived));
 
 // Публичная (без авторизации) электронная версия договора по QR-токену
 export const getPublicContract = (token) =>
@@ -110,12 +135,12 @@ export const getPublicContract = (token) =>
 export const FRONTEND_BASE_URL = "https://redcrm.uz";
 
 // Отправка уведомления об авансе в Telegram (POST /events/{id}/send_advance_notification/)
-export const sendAdvanceNotification = (eventId, phone) =>
-  api.post(`/events/${eventId}/send_advance_notification/`, phone ? { phone } : {});
+export const sendAdvanceNotification = (eventId, phone, idempotencyKey) =>
+  api.post(`/events/${eventId}/send_advance_notification/`, phone ? { phone } : {}, idempotencyConfig(idempotencyKey));
 
 // История отправок уведомлений об авансе (GET /events/{id}/advance_notification_logs/)
-export const getAdvanceNotificationLogs = (eventId) =>
-  api.get(`/events/${eventId}/advance_notification_logs/`);
+export const getAdvanceNotificationLogs = (eventId, includeArchived = false) =>
+  api.get(`/events/${eventId}/advance_notification_logs/`, archivedParams(includeArchived));
 
 // Настройки уведомлений работникам
 export const getWorkerNotificationSettings = () =>
@@ -123,7 +148,7 @@ export const getWorkerNotificationSettings = () =>
 export const updateWorkerNotificationSettings = (data) =>
   api.put("/worker-notification-settings/", data);
 
-// История уведомлений работникам
+// История уведомлений работникам (params.include_archived = 1 - вместе с архивом)
 export const getWorkerNotificationLogs = (params = {}) =>
   api.get("/worker-notification-logs/", { params });
 
@@ -1,6 +1,6 @@
-import React, { useState, useEffect, useMemo } from 'react';
+import React, { useState, useEffect, useMemo, useRef } from 'react';
 import { FaMoneyBillWave, FaTimes, FaHistory, FaPlus, FaMinus, FaEdit, FaPaperPlane } from 'react-icons/fa';
-import { updateEventAdvance, getEventById, sendAdvanceNotification, getAdvanceNotificationLogs } from '../api.js';
+import { updateEventAdvance, getEventById, sendAdvanceNotification, getAdvanceNotificationLogs, newIdempotencyKey } from '../api.js';
 import { toast } from 'react-hot-toast';
 import { format, isValid, parseISO } from 'date-fns';
 import { ru } from 'date-fns/locale';
@@ -10,6 +10,8 @@ const AddAdvanceModal = ({ event, onClose, onUpdate, setErrorMessage }) => {
     const [advanceCurrency, setAdvanceCurrency] = useState(event.advance_money ? 'USD' : 'UZS');
     const [changeType, setChangeType] = useState('add'); // 'add', 'subtract' или 'set'
     const [isLoading, setIsLoading] = useState(false);
+    // Ключ идемпотентности на каждый номер - до первой успешной отправки
+    const sendKeys = useRef({});
     const [rawAmount, setRawAmount] = useState(''); // Необработанное значение для вычислений
     const [currentEvent, setCurrentEvent] = useState(event);
     const [advanceHistory, setAdvanceHistory] = useState([]);
@@ -62,7 +64,9 @@ const AddAdvanceModal = ({ event, onClose, onUpdate, setErrorMessage }) => {
         
         setSendingPhone(phoneNumber);
         try {
-            const response = await sendAdvanceNotification(event.id, phoneNumber);
+            sendKeys.current[phoneNumber] = sendKeys.current[phoneNumber] || newIdempotencyKey();
+            const response = await sendAdvanceNotification(event.id, phoneNumber, sendKeys.current[phoneNumber]);
+            delete sendKeys.current[phoneNumber];
             const status = response?.data?.status || 'success';
             setSentStatus((prev) => ({ ...prev, [phoneNumber]: status }));
             setNotificationHistory((prev) => [
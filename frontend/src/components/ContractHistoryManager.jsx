@@ -11,6 +11,7 @@ const FIELD_LABELS = {
     client: 'Клиент',
     name: 'Имя клиента',
     phone_number: 'Телефон клиента',
+    merged_client: 'Объединён дубликат',
 };
 
 const formatNumber = (num) => {
@@ -103,6 +103,7 @@ const EditEventModal = ({event, onClose, onUpdate}) => {
 
         // Инициализация выбранных услуг
         const initialSelectedServices = eventData.devices.map((device) => ({
+            id: device.id,
             service: device.service,
             eventDate: device.event_service_date,
             restaurant_name: device.restaurant_name,
@@ -375,6 +376,8 @@ const EditEventModal = ({event, onClose, onUpdate}) => {
             id: event.id,
             client: {name: clientName, is_vip: isVIP, phones: phoneNumbers},
             devices: selectedServices.map((service) => ({
+                // id есть только у уже сохранённых устройств - их сервер обновит, а не пересоздаст
+                id: service.id,
                 service: service.service,
                 camera_count: parseInt(service.cameraCount) || 0,
                 restaurant_name: service.restaurant_name,
@@ -7,7 +7,6 @@ import {
     format,
     isSameMonth,
     isToday,
-    parse,
     parseISO,
     isWithinInterval,
     isValid,
@@ -23,13 +22,12 @@ import ContractHistoryManager from "./ContractHistoryManager.jsx";
 import {GlobalContext} from "./BaseContex.jsx";
 import {canManageEvents, isAdmin} from "../utils/roles.js";
 import {useWorkers} from '../hooks/useWorkers';
+import {useEvent, useEventCalendar} from '../hooks/useEvents';
 
 const capitalize = (text) => text.charAt(0).toUpperCase() + text.slice(1);
 
 const EventCalendar = ({
-                           events = [],
                            services = [],
-                           loading = false,
                            onUpdateEvent,
                            setErrorMessage,
                            searchQuery = '',
@@ -38,7 +36,8 @@ const EventCalendar = ({
                            filterEndDate = '',
                        }) => {
     const [currentMonth, setCurrentMonth] = useState(new Date());
-    const [selectedDevice, setSelectedDevice] = useState(null);
+    // Выбранная ячейка календаря: {device_id, event_id}; полное мероприятие грузится по клику
+    const [selectedRow, setSelectedRow] = useState(null);
     const [isModalOpen, setModalOpen] = useState(false);
 
     const [editEvent, setEditEvent] = useState(null);
@@ -54,6 +53,14 @@ const EventCalendar = ({
     const startDate = startOfWeek(monthStart, {weekStartsOn: 1});
     const endDate = endOfWeek(monthEnd, {weekStartsOn: 1});
 
+    // Только видимое окно месяца - компактная лента /events/calendar/, а не весь список мероприятий
+    const {data: calendarRows = [], isLoading: loading} = useEventCalendar(
+        format(startDate, 'yyyy-MM-dd'),
+        format(endDate, 'yyyy-MM-dd'),
+    );
+    const {data: selectedEvent, isLoading: selectedEventLoading} = useEvent(selectedRow?.event_id);
+    const selectedDevice = selectedEvent?.devices?.find((device) => device.id === selectedRow?.device_id);
+
     const {user} = useContext(GlobalContext)
 
 
@@ -72,80 +79,39 @@ const EventCalendar = ({
             maximumFractionDigits: isUSD ? 2 : 0,
         }).format(number);
 
-    // Фильтрация событий (такая же логика как в EventList)
-    const filteredEvents = useMemo(() => {
-        if (!events || events.length === 0) {
-            return [];
-        }
-        
-        const searchLower = searchQuery ? searchQuery.toLowerCase() : '';
-        
-        return events.filter((event) => {
-            // Фильтр по поисковому запросу
-            const matchesSearchQuery =
-                !searchQuery ||
-                event.client?.name?.toLowerCase().includes(searchLower) ||
-                event.client?.phones?.some((phone) =>
-                    phone.phone_number.includes(searchQuery)
-                );
-
-            // Фильтр по услуге
-            const matchesService =
-                !filterService ||
-                event.devices?.some((device) => device.service.toString() === filterService);
-
-            // Фильтр по дате
-            const matchesDate =
-                (!filterStartDate && !filterEndDate) ||
-                event.devices?.some((device) => {
-                    if (!device.event_service_date) return false;
-                    const serviceDate = parseISO(device.event_service_date);
-                    const startDate = filterStartDate ? parseISO(filterStartDate) : null;
-                    const endDate = filterEndDate ? parseISO(filterEndDate) : null;
-
-                    if (!isValid(serviceDate)) return false;
-
-                    if (startDate && endDate) {
-                        return isWithinInterval(serviceDate, {
-                            start: startDate,
-                            end: endDate,
-                        });
-                    } else if (startDate) {
-                        return serviceDate >= startDate;
-                    } else if (endDate) {
-                        return serviceDate <= endDate;
-                    }
-                    return true;
-                });
-
-            return matchesSearchQuery && matchesService && matchesDate;
-        });
-    }, [events, searchQuery, filterService, filterStartDate, filterEndDate]);
-
+    // Фильтрация строк календаря (та же логика, что в EventList, по полям компактной ленты)
     const devicesWithDate = useMemo(() => {
-        return filteredEvents.reduce((acc, event) => {
-            if (!event.devices || !Array.isArray(event.devices)) {
-                return acc;
-            }
-            event.devices.forEach((device) => {
-                if (device.event_service_date) {
-                    let deviceDate = parse(device.event_service_date, 'yyyy-MM-dd', new Date());
-                    if (isNaN(deviceDate)) {
-                        deviceDate = parse(device.event_service_date, 'dd.MM.yyyy', new Date());
-                    }
-                    if (!isNaN(deviceDate)) {
-                        acc.push({
-                            device,
-                            event,
-                            date: format(deviceDate, 'yyyy-MM-dd'),
-                            serviceColor: servicesMap[device.service]?.color || '#000',
-                        });
-                    }
+        const searchLower = searchQuery ? searchQuery.toLowerCase() : '';
+        const startFilter = filterStartDate ? parseISO(filterStartDate) : null;
+        const endFilter = filterEndDate ? parseISO(filterEndDate) : null;
+
+        return calendarRows
+            .filter((row) => {
+                const matchesSearchQuery =
+                    !searchQuery ||
+                    row.client_name?.toLowerCase().includes(searchLower) ||
+                    row.client_phones?.some((phone) => phone.includes(searchQuery));
+
+                const matchesService = !filterService || row.service_id.toString() === filterService;
+
+                const serviceDate = parseISO(row.date);
+                let matchesDate = isValid(serviceDate);
+                if (matchesDate && startFilter && endFilter) {
+                    matchesDate = isWithinInterval(serviceDate, {start: startFilter, end: endFilter});
+                } else if (matchesDate && startFilter) {
+                    matchesDate = serviceDate >= startFilter;
+                } else if (matchesDate && endFilter) {
+                    matchesDate = serviceDate <= endFilter;
                 }
-            });
-            return acc;
-        }, []);
-    }, [filteredEvents, servicesMap]);
+
+                return matchesSearchQuery && matchesService && matchesDate;
+            })
+            .map((row) => ({
+                row,
+                date: row.date,
+                serviceColor: row.service_color || servicesMap[row.service_id]?.color || '#000',
+            }));
+    }, [calendarRows, servicesMap, searchQuery, filterService, filterStartDate, filterEndDate]);
 
 
     const workersMap = useMemo(() => {
@@ -161,22 +127,21 @@ const EventCalendar = ({
         setCurrentMonth(newDate);
     }, [currentMonth]);
 
-    const openModal = React.useCallback((device, event) => {
-        const deviceWithEvent = {...device, event};
-        setSelectedDevice(deviceWithEvent);
+    const openModal = React.useCallback((row) => {
+        setSelectedRow(row);
         setModalOpen(true);
     }, []);
 
     const closeModal = React.useCallback(() => {
         setModalOpen(false);
-        setSelectedDevice(null);
+        setSelectedRow(null);
     }, []);
 
     const openEditModal = React.useCallback((event) => {
         // Открываем модальное окно редактирования только при действии пользователя
         setEditEvent(event);
         setModalOpen(false);
-        setSelectedDevice(null);
+        setSelectedRow(null);
     }, []);
 
     const closeEditModal = React.useCallback(() => {
@@ -187,7 +152,7 @@ const EventCalendar = ({
         setAdvanceEvent(event);
         setIsAdvanceModalOpen(true);
         setModalOpen(false);
-        setSelectedDevice(null);
+        setSelectedRow(null);
     }, []);
 
     const closeAdvanceModal = React.useCallback(() => {
@@ -246,23 +211,23 @@ const EventCalendar = ({
                     </div>
                     {dayDevices.length > 0 && (
                         <div className="flex-1 flex flex-col gap-1 p-1">
-                            {dayDevices.map(({device, event, serviceColor}, index) => (
-                                <div key={index}
-                                     onClick={() => openModal(device, event)}
+                            {dayDevices.map(({row, serviceColor}) => (
+                                <div key={row.device_id}
+                                     onClick={() => openModal(row)}
                                      className='flex flex-col gap-1 p-1 rounded-lg cursor-pointer bg-white/5 border border-solid border-white/10 hover:bg-indigo-500/15 transition-colors duration-150' style={{borderColor: serviceColor}}>
                                     <div className="flex items-center gap-1.5">
-                                        <p className='text-xs font-semibold text-white'>{device.restaurant_name || 'Без названия'}</p>
+                                        <p className='text-xs font-semibold text-white'>{row.restaurant_name || 'Без названия'}</p>
                                     </div>
-                                    {device.workers && device.workers.length > 0 && (
+                                    {row.workers && row.workers.length > 0 && (
                                         <div className='text-[8px] sm:text-[10px] text-gray-300 pl-4'>
-                                            {device.workers
+                                            {row.workers
                                                 .map((workerId) => workersMap[workerId])
                                                 .filter(Boolean)
                                                 .sort((a, b) => (a.order || 0) - (b.order || 0))
                                                 .map((worker, workerIndex) => (
                                                     <span key={worker.id} className="inline-block mr-1">
                                                         {worker.name}
-                                                        {workerIndex < device.workers.length - 1 && ','}
+                                                        {workerIndex < row.workers.length - 1 && ','}
                                                     </span>
                                                 ))}
                                         </div>
@@ -278,7 +243,7 @@ const EventCalendar = ({
         return days;
     };
 
-    // Показываем загрузку
+    // Показываем загрузку (при смене месяца остаётся виден предыдущий)
     if (loading) {
         return (
             <div className="flex justify-center items-center h-full min-h-[400px]">
@@ -287,15 +252,6 @@ const EventCalendar = ({
         );
     }
 
-    // Показываем сообщение, если нет событий
-    if (!events || events.length === 0) {
-        return (
-            <div className="p-4 text-center">
-                <p className="text-lg text-gray-500">События не найдены</p>
-            </div>
-        );
-    }
-
     return (
         <div className="p-2 sm:p-4">
             <div className="flex items-center justify-center gap-3 sm:gap-4 mb-4 sm:mb-6">
@@ -325,115 +281,131 @@ const EventCalendar = ({
                 {renderDays()}
             </div>
 
-            {isModalOpen && selectedDevice && (
+            {isModalOpen && selectedRow && (
                 <div className="fixed inset-0 z-50 flex items-center justify-center p-4 sm:p-8 bg-black bg-opacity-50">
-                    <div
-                        className="modal-box relative max-w-sm w-full bg-slate-800 border border-white/10 text-white p-5 sm:p-8 rounded-lg shadow-xl">
-                        {selectedDevice.event.computer_numbers > 0 && (
-                            <span className="absolute top-3 left-4 text-sm text-white/80">
-                                Компьютеров: {selectedDevice.event.computer_numbers}
-                            </span>
-                        )}
-                        <button
-                            onClick={closeModal}
-                            className="absolute top-3 right-3 text-lg text-white hover:text-gray-300 focus:outline-none"
-                        >
-                            ✕
-                        </button>
-                        <h3 className="flex items-center text-xl sm:text-2xl mt-4 font-bold mb-4 sm:mb-6">
-                            <FaCalendarAlt className="mr-2 text-indigo-400"/>
-                            {servicesMap[selectedDevice.service]?.name || 'Неизвестно'}
-                        </h3>
-                        <div className="space-y-2 sm:space-y-4">
-                            <p className="text-sm sm:text-base">
-                                <strong>Клиент:</strong> {selectedDevice.event.client.name}
-                            </p>
-                            <p className="text-sm sm:text-base">
-                                <strong>Телефон:</strong> +{selectedDevice.event.client.phones.map((phone) => phone.phone_number).join(', +')}
-                            </p>
-                            {selectedDevice.restaurant_name && (
-                                <p className="text-sm sm:text-base">
-                                    <strong>Название ресторана:</strong> {selectedDevice.restaurant_name}
-                                </p>
+                    {selectedEventLoading ? (
+                        <div className="flex justify-center items-center p-8">
+                            <span className="loading loading-spinner loading-lg"></span>
+                        </div>
+                    ) : !selectedDevice ? (
+                        <div className="modal-box relative max-w-sm w-full bg-slate-800 text-white p-5 rounded-lg shadow-xl">
+                            <button
+                                onClick={closeModal}
+                                className="absolute top-3 right-3 text-lg text-white hover:text-gray-300 focus:outline-none"
+                            >
+                                ✕
+                            </button>
+                            <p className="text-center">Мероприятие не найдено</p>
+                        </div>
+                    ) : (
+                        <div
+                            className="modal-box relative max-w-sm w-full bg-slate-800 border border-white/10 text-white p-5 sm:p-8 rounded-lg shadow-xl">
+                            {selectedEvent.computer_numbers > 0 && (
+                                <span className="absolute top-3 left-4 text-sm text-white/80">
+                                    Компьютеров: {selectedEvent.computer_numbers}
+                                </span>
                             )}
-                            {selectedDevice.camera_count && (
+                            <button
+                                onClick={closeModal}
+                                className="absolute top-3 right-3 text-lg text-white hover:text-gray-300 focus:outline-none"
+                            >
+                                ✕
+                            </button>
+                            <h3 className="flex items-center text-xl sm:text-2xl mt-4 font-bold mb-4 sm:mb-6">
+                                <FaCalendarAlt className="mr-2 text-indigo-400"/>
+                                {servicesMap[selectedDevice.service]?.name || 'Неизвестно'}
+                            </h3>
+                            <div className="space-y-2 sm:space-y-4">
                                 <p className="text-sm sm:text-base">
-                                    <strong>Количество камер:</strong> {selectedDevice.camera_count}
+                                    <strong>Клиент:</strong> {selectedEvent.client.name}
                                 </p>
-                            )}
-                            {selectedDevice.comment && (
                                 <p className="text-sm sm:text-base">
-                                    <strong>Комментарий:</strong> {selectedDevice.comment}
+                                    <strong>Телефон:</strong> +{selectedEvent.client.phones.map((phone) => phone.phone_number).join(', +')}
                                 </p>
-                            )}
-                            <div className="flex items-center text-sm sm:text-base">
-                                <p>
-                                    <strong>Работники: </strong>
-                                    {selectedDevice.workers && selectedDevice.workers.length > 0
-                                        ? selectedDevice.workers
-                                            .map((workerId) => workersMap[workerId])
-                                            .filter(Boolean)
-                                            .sort((a, b) => (a.order || 0) - (b.order || 0))
-                                            .map(worker => worker.name)
-                                            .join(', ')
-                                        : 'Нет работников'}
-                                </p>
-                            </div>
-                            <p>
-                                <strong>Общая
-                                    сумма:</strong> {formatCurrency(selectedDevice.event.amount, selectedDevice.event.amount_money)}
-                            </p>
-                            <p>
-                                <strong>Аванс:</strong> {formatCurrency(selectedDevice.event.advance, selectedDevice.event.advance_money)}
-                            </p>
-                            <p>
-                                <strong>Остаток:</strong>{' '}
-                                {formatCurrency(
-                                    selectedDevice.event.amount - selectedDevice.event.advance,
-                                    selectedDevice.event.amount_money
+                                {selectedDevice.restaurant_name && (
+                                    <p className="text-sm sm:text-base">
+                                        <strong>Название ресторана:</strong> {selectedDevice.restaurant_name}
+                                    </p>
                                 )}
-                            </p>
-                            {selectedDevice.event.comment && (
-                                <p className="text-sm sm:text-base">
-                                    <strong>Общий комментарий:</strong> {selectedDevice.event.comment}
-                                </p>
-                            )}
-                        </div>
-                        {(userIsAdmin || userCanManage) && (
-                            <div className="mt-4 sm:mt-6 flex gap-1.5 sm:gap-2">
-                                {userIsAdmin && (
-                                    <button
-                                        onClick={() => openEditModal(selectedDevice.event)}
-                                        title="Редактировать"
-                                        className="flex-1 min-w-0 flex flex-col items-center justify-center gap-1 bg-white/5 hover:bg-indigo-500/20 border border-white/10 transition-colors duration-150 text-white text-xs py-2 px-1 rounded-lg"
-                                    >
-                                        <FaEdit/>
-                                        <span className="hidden sm:inline truncate">Редактировать</span>
-                                    </button>
+                                {selectedDevice.camera_count && (
+                                    <p className="text-sm sm:text-base">
+                                        <strong>Количество камер:</strong> {selectedDevice.camera_count}
+                                    </p>
                                 )}
-                                {userCanManage && (
-                                    <button
-                                        onClick={() => openAdvanceModal(selectedDevice.event)}
-                                        title="Добавить аванс"
-                                        className="flex-1 min-w-0 flex flex-col items-center justify-center gap-1 bg-white/5 hover:bg-indigo-500/20 border border-white/10 transition-colors duration-150 text-white text-xs py-2 px-1 rounded-lg"
-                                    >
-                                        <FaMoneyBillWave/>
-                                        <span className="hidden sm:inline truncate">Аванс</span>
-                                    </button>
+                                {selectedDevice.comment && (
+                                    <p className="text-sm sm:text-base">
+                                        <strong>Комментарий:</strong> {selectedDevice.comment}
+                                    </p>
                                 )}
-                                {userIsAdmin && (
-                                    <button
-                                        onClick={() => openHistoryModal(selectedDevice.event)}
-                                        title="История изменений договора"
-                                        className="flex-1 min-w-0 flex flex-col items-center justify-center gap-1 bg-white/5 hover:bg-indigo-500/20 border border-white/10 transition-colors duration-150 text-white text-xs py-2 px-1 rounded-lg"
-                                    >
-                                        <FaHistory/>
-                                        <span className="hidden sm:inline truncate">История</span>
-                                    </button>
+                                <div className="flex items-center text-sm sm:text-base">
+                                    <p>
+                                        <strong>Работники: </strong>
+                                        {selectedDevice.workers && selectedDevice.workers.length > 0
+                                            ? selectedDevice.workers
+                                                .map((workerId) => workersMap[workerId])
+                                                .filter(Boolean)
+                                                .sort((a, b) => (a.order || 0) - (b.order || 0))
+                                                .map(worker => worker.name)
+                                                .join(', ')
+                                            : 'Нет работников'}
+                                    </p>
+                                </div>
+                                <p>
+                                    <strong>Общая
+                                        сумма:</strong> {formatCurrency(selectedEvent.amount, selectedEvent.amount_money)}
+                                </p>
+                                <p>
+                                    <strong>Аванс:</strong> {formatCurrency(selectedEvent.advance, selectedEvent.advance_money)}
+                                </p>
+                                <p>
+                                    <strong>Остаток:</strong>{' '}
+                                    {formatCurrency(
+                                        selectedEvent.amount - selectedEvent.advance,
+                                        selectedEvent.amount_money
+                                    )}
+                                </p>
+                                {selectedEvent.comment && (
+                                    <p className="text-sm sm:text-base">
+                                        <strong>Общий комментарий:</strong> {selectedEvent.comment}
+                                    </p>
                                 )}
                             </div>
-                        )}
-                    </div>
+                            {(userIsAdmin || userCanManage) && (
+                                <div className="mt-4 sm:mt-6 flex gap-1.5 sm:gap-2">
+                                    {userIsAdmin && (
+                                        <button
+                                            onClick={() => openEditModal(selectedEvent)}
+                                            title="Редактировать"
+                                            className="flex-1 min-w-0 flex flex-col items-center justify-center gap-1 bg-white/5 hover:bg-indigo-500/20 border border-white/10 transition-colors duration-150 text-white text-xs py-2 px-1 rounded-lg"
+                                        >
+                                            <FaEdit/>
+                                            <span className="hidden sm:inline truncate">Редактировать</span>
+                                        </button>
+                                    )}
+                                    {userCanManage && (
+                                        <button
+                                            onClick={() => openAdvanceModal(selectedEvent)}
+                                            title="Добавить аванс"
+                                            className="flex-1 min-w-0 flex flex-col items-center justify-center gap-1 bg-white/5 hover:bg-indigo-500/20 border border-white/10 transition-colors duration-150 text-white text-xs py-2 px-1 rounded-lg"
+                                        >
+                                            <FaMoneyBillWave/>
+                                            <span className="hidden sm:inline truncate">Аванс</span>
+                                        </button>
+                                    )}
+                                    {userIsAdmin && (
+                                        <button
+                                            onClick={() => openHistoryModal(selectedEvent)}
+                                            title="История изменений договора"
+                                            className="flex-1 min-w-0 flex flex-col items-center justify-center gap-1 bg-white/5 hover:bg-indigo-500/20 border border-white/10 transition-colors duration-150 text-white text-xs py-2 px-1 rounded-lg"
+                                        >
+                                            <FaHistory/>
+                                            <span className="hidden sm:inline truncate">История</span>
+                                        </button>
+                                    )}
+                                </div>
+                            )}
+                        </div>
+                    )}
                 </div>
             )}
 
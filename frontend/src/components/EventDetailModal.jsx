@@ -1,14 +1,16 @@
-import React, {useEffect, useMemo, useState} from 'react';
+import React, {useEffect, useMemo, useRef, useState} from 'react';
 import {createPortal} from 'react-dom';
 import {format, isValid, parseISO} from 'date-fns';
 import {ru} from 'date-fns/locale';
 import QRCode from 'qrcode';
-import {getEventContractLogs, sendEventContract, FRONTEND_BASE_URL} from '../api';
+import {getEventContractLogs, sendEventContract, newIdempotencyKey, FRONTEND_BASE_URL} from '../api';
 import {formatContractCurrency, formatContractDate} from '../utils/contractFormat';
 import {toast} from 'react-hot-toast';
 
 const EventDetailModal = ({event, services, servicesColor, workersMap, onClose}) => {
     const [sendingPhone, setSendingPhone] = useState(null);
+    // Ключ идемпотентности на каждый номер - до первой успешной отправки
+    const sendKeys = useRef({});
     const [sentStatus, setSentStatus] = useState({});
     const [history, setHistory] = useState(() => event.telegram_logs || event.telegram_history || []);
     const [historyLoading, setHistoryLoading] = useState(false);
@@ -77,7 +79,9 @@ const EventDetailModal = ({event, services, servicesColor, workersMap, onClose})
         
         setSendingPhone(phoneNumber);
         try {
-            const response = await sendEventContract(event.id, phoneNumber);
+            sendKeys.current[phoneNumber] = sendKeys.current[phoneNumber] || newIdempotencyKey();
+            const response = await sendEventContract(event.id, phoneNumber, sendKeys.current[phoneNumber]);
+            delete sendKeys.current[phoneNumber];
             const status = response?.data?.status || 'success';
             setSentStatus((prev) => ({...prev, [phoneNumber]: status}));
             setHistory((prev) => [
@@ -1,19 +1,22 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { getEvents, getEventById, createEvent, updateEvent, deleteEvent } from '../api';
+import { getEvents, getEventById, getEventCalendar, createEvent, updateEvent, deleteEvent } from '../api';
 
 // Query keys для кэширования
 export const eventKeys = {
     all: ['events'],
     lists: () => [...eventKeys.all, 'list'],
     list: (filters, page) => [...eventKeys.lists(), { filters, page }],
+    // Внутри lists(): любое изменение мероприятия инвалидирует и календарь
+    calendar: (from, to) => [...eventKeys.lists(), 'calendar', { from, to }],
     details: () => [...eventKeys.all, 'detail'],
     detail: (id) => [...eventKeys.details(), id],
 };
 
 // Хук для получения всех событий с пагинацией
-export const useEvents = (page = 1, pageSize = 10, usePagination = true) => {
+export const useEvents = (page = 1, pageSize = 10, usePagination = true, enabled = true) => {
     return useQuery({
         queryKey: eventKeys.list(null, usePagination ? page : 'all'),
+        enabled,
         queryFn: async () => {
             const response = await getEvents(page, pageSize, usePagination);
             const data = response.data;
@@ -44,6 +47,19 @@ export const useEvents = (page = 1, pageSize = 10, usePagination = true) => {
     });
 };
 
+// Хук для компактной ленты календаря: по строке на устройство с датой услуги в [from, to]
+export const useEventCalendar = (from, to) => {
+    return useQuery({
+        queryKey: eventKeys.calendar(from, to),
+        queryFn: async () => {
+            const response = await getEventCalendar(from, to);
+            return response.data;
+        },
+        staleTime: 2 * 60 * 1000,
+        keepPreviousData: true, // Старый месяц виден, пока грузится новый
+    });
+};
+
 // Хук для получения события по ID
 export const useEvent = (eventId) => {
     return useQuery({
@@ -61,7 +77,7 @@ export const useCreateEvent = () => {
     const queryClient = useQueryClient();
     
     return useMutation({
-        mutationFn: createEvent,
+        mutationFn: ({ data, idempotencyKey }) => createEvent(data, idempotencyKey),
         onSuccess: (response) => {
             // Инвалидируем кэш списка событий
             queryClient.invalidateQueries({ queryKey: eventKeys.lists() });
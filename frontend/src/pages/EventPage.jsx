@@ -1,5 +1,5 @@
 // EventPage.js
-import React, {useContext, useState, useMemo, useCallback, useEffect} from 'react';
+import React, {useContext, useState, useMemo, useCallback, useEffect, useRef} from 'react';
 import AddEventModal from '../components/AddEventModal';
 import EventCalendar from '../components/EventCalendar';
 import {GlobalContext} from "../components/BaseContex.jsx";
@@ -12,6 +12,7 @@ import {useEvents, useCreateEvent, useDeleteEvent, eventKeys} from '../hooks/use
 import {useServices} from '../hooks/useServices';
 import {toast} from 'react-hot-toast';
 import Pagination from '../components/Pagination';
+import {newIdempotencyKey} from '../api';
 
 const EventPage = () => {
     // Состояние для пагинации
@@ -45,14 +46,15 @@ const EventPage = () => {
         );
     }, [debouncedSearchQuery, filterService, filterStartDate, filterEndDate]);
 
-    // Для календаря всегда отключаем пагинацию, для списка - только при фильтрах
+    // Пагинация для списка без фильтров; календарь грузит свою ленту сам (useEventCalendar)
     const shouldUsePagination = viewMode === 'list' && !hasActiveFilters;
 
     // Используем React Query хуки с пагинацией
     const { data: eventsData, isLoading: loading, error: eventsError } = useEvents(
         currentPage, 
         pageSize, 
-        shouldUsePagination // Пагинация только для списка без фильтров
+        shouldUsePagination, // Пагинация только для списка без фильтров
+        viewMode === 'list' // В режиме календаря полный список не запрашиваем
     );
     const { data: services = [] } = useServices();
     
@@ -72,6 +74,8 @@ const EventPage = () => {
     
     const queryClient = useQueryClient();
     const createEventMutation = useCreateEvent();
+    // Один ключ на одно добавление: повторная отправка после обрыва связи не создаст дубль
+    const createKeyRef = useRef(newIdempotencyKey());
     const deleteEventMutation = useDeleteEvent();
 
     const {user} = useContext(GlobalContext);
@@ -91,7 +95,11 @@ const EventPage = () => {
 
     const handleCreate = useCallback(async (newEventData) => {
         try {
-            const response = await createEventMutation.mutateAsync(newEventData);
+            const response = await createEventMutation.mutateAsync({
+                data: newEventData,
+                idempotencyKey: createKeyRef.current,
+            });
+            createKeyRef.current = newIdempotencyKey();
             setModalVisible(false);
             setSuccessMessage('Событие успешно добавлено');
             toast.success('Событие успешно добавлено');
@@ -288,8 +296,6 @@ const EventPage = () => {
             {/* Отображаем либо EventList, либо EventCalendar в зависимости от состояния viewMode */}
             {viewMode === 'calendar' ? (
                 <EventCalendar
-                    events={events}
-                    loading={loading}
                     onDeleteEvent={handleDeleteEvent}
                     onUpdateEvent={handleUpdateEvent}
                     setErrorMessage={setErrorMessage}